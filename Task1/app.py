@@ -4,20 +4,36 @@ import os
 from datetime import datetime
 import time
 import re
+import sys
 from urllib.parse import urlparse, parse_qs
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from bs4 import BeautifulSoup
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.rate_control import page_load_controller, record_page_load
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
 class SpotifyPlaylistAnalyzer:
-    def __init__(self, headless=True):
-        """Initialize the analyzer with Selenium WebDriver."""
+    def __init__(self, headless=True, rate_controller=None, start_browser=True):
+        """Initialize the analyzer with Selenium WebDriver.
+
+        Pass the same rate_controller to every analyzer that runs concurrently
+        so page loads are throttled together. With start_browser=False no
+        Chrome process is started and only the parsing methods are usable.
+        """
         self.results_dir = "SpotifyData"
         os.makedirs(self.results_dir, exist_ok=True)
+        self.rate_controller = rate_controller or page_load_controller()
+        self.driver = None
+        self.wait = None
+        if not start_browser:
+            return
         
         # Setup Chrome options
         chrome_options = Options()
@@ -27,10 +43,13 @@ class SpotifyPlaylistAnalyzer:
         chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+        chrome_options.add_argument(f"--user-agent={USER_AGENT}")
+        # Network events let load_page() see the real HTTP status of each navigation
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
         
         # Initialize driver
         self.driver = webdriver.Chrome(options=chrome_options)
+        self.driver.set_page_load_timeout(60)
         self.wait = WebDriverWait(self.driver, 30)
 
     def extract_playlist_id(self, url):
@@ -134,51 +153,90 @@ class SpotifyPlaylistAnalyzer:
         
         return durations
 
+    def get_navigation_response(self):
+        """Return (status, retry_after) of the main document from the performance log.
+
+        The log is drained on every call, so calling this right before and
+        after driver.get() isolates one navigation. Returns (None, None) if
+        no document response was logged.
+        """
+        try:
+            entries = self.driver.get_log("performance")
+        except WebDriverException:
+            return None, None
+
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            if message.get("method") != "Network.responseReceived":
+                continue
+            params = message.get("params", {})
+            # The first document response is the page itself; later ones are iframes
+            if params.get("type") != "Document":
+                continue
+            response = params.get("response", {})
+            headers = {k.lower(): v for k, v in response.get("headers", {}).items()}
+            return response.get("status"), headers.get("retry-after")
+
+        return None, None
+
+    def load_page(self, url, max_attempts=3):
+        """Load a page through the shared rate controller, backing off on throttling."""
+        for attempt in range(1, max_attempts + 1):
+            with self.rate_controller.slot():
+                self.get_navigation_response()  # drop entries from earlier pages
+                start = time.monotonic()
+                try:
+                    self.driver.get(url)
+                except TimeoutException:
+                    record_page_load(self.rate_controller, url, time.monotonic() - start, timed_out=True)
+                    print(f"Page load timed out (attempt {attempt}/{max_attempts})")
+                    continue
+
+                latency = time.monotonic() - start
+                status, retry_after = self.get_navigation_response()
+                if record_page_load(self.rate_controller, url, latency, status, retry_after):
+                    return
+                print(f"Page returned status {status} (attempt {attempt}/{max_attempts})")
+
+        raise TimeoutException(f"Could not load {url} after {max_attempts} attempts")
+
+    def fetch_playlist_html(self, playlist_url):
+        """Load a playlist page, trigger lazy loading and return the rendered HTML."""
+        # Load the playlist page
+        self.load_page(playlist_url)
+        print("Page loaded, waiting for content...")
+        time.sleep(10)  # Increased wait time
+        
+        # Try to wait for playlist content
+        try:
+            self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "[data-testid='playlist-page']")))
+            print("Playlist page detected")
+        except TimeoutException:
+            print("Playlist page selector not found, trying alternatives...")
+            try:
+                self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "main")))
+                print("Main content detected")
+            except TimeoutException:
+                print("Warning: Could not detect page structure, continuing anyway...")
+        
+        # Scroll to load more tracks
+        self.scroll_and_load_tracks()
+        
+        # Get page source
+        return self.driver.page_source
+
     def scrape_playlist_data(self, playlist_url):
         """Hybrid scraping approach combining both methods."""
         print(f"Scraping playlist: {playlist_url}")
         
         try:
-            # Load the playlist page
-            self.driver.get(playlist_url)
-            print("Page loaded, waiting for content...")
-            time.sleep(10)  # Increased wait time
-            
-            # Try to wait for playlist content
-            try:
-                self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "[data-testid='playlist-page']")))
-                print("Playlist page detected")
-            except TimeoutException:
-                print("Playlist page selector not found, trying alternatives...")
-                try:
-                    self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "main")))
-                    print("Main content detected")
-                except TimeoutException:
-                    print("Warning: Could not detect page structure, continuing anyway...")
-            
-            # Scroll to load more tracks
-            self.scroll_and_load_tracks()
-            
-            # Get page source
-            html_content = self.driver.page_source
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Save debug HTML
-            debug_file = os.path.join(self.results_dir, f"debug_page_{int(time.time())}.html")
-            with open(debug_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            print(f"Debug HTML saved to: {debug_file}")
+            html_content = self.fetch_playlist_html(playlist_url)
+            self.save_debug_html(html_content)
             
-            # Extract playlist metadata using the working method
-            playlist_metadata = self.extract_playlist_metadata(soup, html_content)
-            
-            # Extract track data using hybrid approach
-            tracks_data = self.extract_tracks_hybrid(soup, html_content)
-            
-            return {
-                "playlist_metadata": playlist_metadata,
-                "tracks": tracks_data[:20]  # Limit to top 20 tracks
-            }
+            return self.parse_playlist_html(html_content)
             
         except Exception as e:
             print(f"Error scraping playlist: {str(e)}")
@@ -186,6 +244,29 @@ class SpotifyPlaylistAnalyzer:
             traceback.print_exc()
             return None
 
+    def save_debug_html(self, html_content):
+        """Save a raw HTML snapshot for troubleshooting."""
+        debug_file = os.path.join(self.results_dir, f"debug_page_{int(time.time())}.html")
+        with open(debug_file, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+        print(f"Debug HTML saved to: {debug_file}")
+        return debug_file
+
+    def parse_playlist_html(self, html_content):
+        """Extract playlist metadata and tracks from a rendered page source."""
+        soup = BeautifulSoup(html_content, 'html.parser')
+        
+        # Extract playlist metadata using the working method
+        playlist_metadata = self.extract_playlist_metadata(soup, html_content)
+        
+        # Extract track data using hybrid approach
+        tracks_data = self.extract_tracks_hybrid(soup, html_content)
+        
+        return {
+            "playlist_metadata": playlist_metadata,
+            "tracks": tracks_data[:20]  # Limit to top 20 tracks
+        }
+
     def extract_playlist_metadata(self, soup, html_content):
         """Extract playlist metadata using enhanced selectors."""
         metadata = {
@@ -556,6 +637,10 @@ class SpotifyPlaylistAnalyzer:
         if not playlist_data:
             return {"error": "Failed to scrape playlist data"}
         
+        return self.build_analysis(playlist_url, playlist_data)
+
+    def build_analysis(self, playlist_url, playlist_data):
+        """Assemble the final analysis dict from scraped playlist data."""
         # Calculate duration from tracks if available
         if playlist_data["tracks"]:
             calculated_duration = self.calculate_total_duration(playlist_data["tracks"])
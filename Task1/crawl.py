@@ -0,0 +1,61 @@
+import argparse
+
+from app import SpotifyPlaylistAnalyzer
+from common.crawl_frontier import CrawlFrontier, DEFAULT_DB_PATH
+
+
+def crawl(frontier, analyzer, max_playlists=None, batch_size=10):
+    """Analyze due playlists from the frontier until it is drained or the cap is hit."""
+    crawled = failed = 0
+
+    while max_playlists is None or crawled + failed < max_playlists:
+        limit = batch_size if max_playlists is None else min(batch_size, max_playlists - crawled - failed)
+        batch = frontier.claim(limit)
+        if not batch:
+            print("No playlists due")
+            break
+
+        for playlist in batch:
+            try:
+                analysis = analyzer.analyze_playlist(playlist["url"])
+                if "error" in analysis:
+                    frontier.fail(playlist["playlist_id"], analysis["error"])
+                    failed += 1
+                    continue
+                analyzer.save_analysis(analysis, f"{playlist['playlist_id']}.json")
+                frontier.complete(playlist["playlist_id"], scraped_tracks=analysis["playlist_metadata"].get("number_of_songs") or None)
+                crawled += 1
+            except Exception as e:
+                print(f"Error crawling {playlist['url']}: {str(e)}")
+                frontier.fail(playlist["playlist_id"], e)
+                failed += 1
+
+    return crawled, failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analyze playlists queued in the crawl frontier.")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    parser.add_argument("--max", type=int, default=None, help="stop after this many playlists")
+    parser.add_argument("--batch-size", type=int, default=10)
+    args = parser.parse_args()
+
+    frontier = CrawlFrontier(args.db)
+    analyzer = None
+
+    try:
+        print(f"Frontier: {frontier.stats()}")
+        analyzer = SpotifyPlaylistAnalyzer(headless=True)
+        crawled, failed = crawl(frontier, analyzer, args.max, args.batch_size)
+        print(f"Crawled {crawled} playlists, {failed} failed")
+        print(f"Frontier: {frontier.stats()}")
+
+    except KeyboardInterrupt:
+        # Claimed playlists become due again when their lease expires
+        print("\nCrawl interrupted by user")
+
+    finally:
+        if analyzer:
+            analyzer.close()
+        frontier.close()
+        print("Process finished")
@@ -0,0 +1,272 @@
+import argparse
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+
+from app import SpotifyPlaylistAnalyzer, USER_AGENT
+from common.rate_control import page_load_controller, record_page_load
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def process_tree_rss(root_pid=None):
+    """Return the total RSS in bytes of a process and all of its descendants."""
+    root_pid = root_pid or os.getpid()
+
+    if psutil is not None:
+        try:
+            root = psutil.Process(root_pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return 0
+        total = 0
+        for proc in processes:
+            try:
+                total += proc.memory_info().rss
+            except psutil.NoSuchProcess:
+                continue
+        return total
+
+    # Fallback for Linux without psutil: walk /proc
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # Field 4 is the parent PID; split after the command name
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    total = 0
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, []))
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            continue
+    return total
+
+
+class RssSampler:
+    """Background thread recording peak RSS of this process tree."""
+
+    def __init__(self, interval=0.5):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, process_tree_rss())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, process_tree_rss())
+
+
+class MultiContextPlaylistAnalyzer:
+    """Analyze many playlists concurrently in one shared Chromium process.
+
+    Every playlist gets its own isolated browser context (cookies, storage and
+    cache are not shared) but all contexts live in a single browser, so the
+    per-playlist cost is a renderer rather than a whole Chrome instance. Page
+    waits and scrolling are awaited, so they overlap across playlists.
+    """
+
+    def __init__(self, concurrency=4, headless=True, rate_controller=None):
+        """Initialize the analyzer; the browser is launched in analyze_playlists()."""
+        self.concurrency = concurrency
+        self.headless = headless
+        self.rate_controller = rate_controller or page_load_controller(concurrency)
+        # Reuse the Selenium analyzer's parsing methods without starting Chrome
+        self.parser = SpotifyPlaylistAnalyzer(rate_controller=self.rate_controller, start_browser=False)
+
+    async def load_page(self, page, url, max_attempts=3):
+        """Load a page through the shared rate controller, backing off on throttling."""
+        for attempt in range(1, max_attempts + 1):
+            await asyncio.to_thread(self.rate_controller.acquire)
+            try:
+                start = time.monotonic()
+                try:
+                    response = await page.goto(url, timeout=60000, wait_until="domcontentloaded")
+                except PlaywrightTimeoutError:
+                    record_page_load(self.rate_controller, url, time.monotonic() - start, timed_out=True)
+                    print(f"Page load timed out (attempt {attempt}/{max_attempts}): {url}")
+                    continue
+
+                latency = time.monotonic() - start
+                status = response.status if response else None
+                retry_after = response.headers.get("retry-after") if response else None
+                if record_page_load(self.rate_controller, url, latency, status, retry_after):
+                    return
+                print(f"Page returned status {status} (attempt {attempt}/{max_attempts}): {url}")
+            finally:
+                self.rate_controller.release()
+
+        raise PlaywrightTimeoutError(f"Could not load {url} after {max_attempts} attempts")
+
+    async def scrape_playlist_html(self, browser, playlist_url):
+        """Load a playlist in a fresh browser context and return its rendered HTML."""
+        context = await browser.new_context(user_agent=USER_AGENT, viewport={"width": 1920, "height": 1080})
+        try:
+            page = await context.new_page()
+            await self.load_page(page, playlist_url)
+            print(f"Page loaded, waiting for content: {playlist_url}")
+            await asyncio.sleep(10)
+
+            try:
+                await page.wait_for_selector("[data-testid='playlist-page']", timeout=30000)
+            except PlaywrightTimeoutError:
+                try:
+                    await page.wait_for_selector("main", timeout=30000)
+                except PlaywrightTimeoutError:
+                    print("Warning: Could not detect page structure, continuing anyway...")
+
+            # Same scrolling as scroll_and_load_tracks, but without blocking other tabs
+            for i in range(5):
+                await page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
+                await asyncio.sleep(3)
+            await page.evaluate("window.scrollTo(0, 0);")
+            await asyncio.sleep(2)
+
+            return await page.content()
+        finally:
+            await context.close()
+
+    async def analyze_one(self, browser, semaphore, playlist_url):
+        """Scrape and parse a single playlist, returning its analysis dict."""
+        async with semaphore:
+            print(f"Starting analysis of playlist: {playlist_url}")
+            try:
+                html_content = await self.scrape_playlist_html(browser, playlist_url)
+            except Exception as e:
+                print(f"Error scraping playlist {playlist_url}: {str(e)}")
+                return {"error": "Failed to scrape playlist data", "url": playlist_url}
+
+        # Parse outside the semaphore so the next playlist can start loading
+        playlist_data = await asyncio.to_thread(self.parser.parse_playlist_html, html_content)
+        return self.parser.build_analysis(playlist_url, playlist_data)
+
+    async def analyze_playlists_async(self, playlist_urls):
+        """Analyze all playlists with up to `concurrency` contexts open at once."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(
+                headless=self.headless,
+                args=["--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu"]
+            )
+            try:
+                return await asyncio.gather(*[
+                    self.analyze_one(browser, semaphore, url) for url in playlist_urls
+                ])
+            finally:
+                await browser.close()
+
+    def analyze_playlists(self, playlist_urls):
+        """Synchronous wrapper around analyze_playlists_async()."""
+        return asyncio.run(self.analyze_playlists_async(playlist_urls))
+
+    def save_analyses(self, analyses):
+        """Save each successful analysis to its own JSON file."""
+        return [self.parser.save_analysis(a) for a in analyses if "error" not in a]
+
+
+def analyze_with_drivers(playlist_urls, concurrency=4, headless=True):
+    """Baseline mode: one Chrome/WebDriver per in-flight playlist."""
+    controller = page_load_controller(concurrency)
+
+    def run(url):
+        analyzer = None
+        try:
+            analyzer = SpotifyPlaylistAnalyzer(headless=headless, rate_controller=controller)
+            return analyzer.analyze_playlist(url)
+        finally:
+            if analyzer:
+                analyzer.close()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(run, playlist_urls))
+
+
+def benchmark(playlist_urls, concurrency=4, headless=True):
+    """Compare RSS per in-flight playlist and throughput for both execution modes."""
+    modes = {
+        "multi-context": lambda: MultiContextPlaylistAnalyzer(concurrency, headless).analyze_playlists(playlist_urls),
+        "driver-per-playlist": lambda: analyze_with_drivers(playlist_urls, concurrency, headless),
+    }
+    in_flight = min(concurrency, len(playlist_urls))
+    report = {}
+
+    for mode, run in modes.items():
+        baseline = process_tree_rss()
+        start = time.monotonic()
+        with RssSampler() as sampler:
+            analyses = run()
+        elapsed = time.monotonic() - start
+
+        succeeded = sum(1 for a in analyses if "error" not in a)
+        report[mode] = {
+            "playlists": len(playlist_urls),
+            "succeeded": succeeded,
+            "seconds": round(elapsed, 1),
+            "playlists_per_min": round(60 * len(playlist_urls) / elapsed, 2) if elapsed else 0,
+            "peak_rss_mb": round(sampler.peak / 2**20, 1),
+            "rss_per_in_flight_mb": round((sampler.peak - baseline) / 2**20 / in_flight, 1),
+        }
+
+    return report
+
+
+def print_benchmark(report):
+    """Print the benchmark report as a table."""
+    print("\n" + "="*70)
+    print("EXECUTION MODE COMPARISON")
+    print("="*70)
+    print(f"{'Mode':<22}{'OK':>6}{'Seconds':>10}{'Per min':>10}{'Peak MB':>10}{'MB/playlist':>13}")
+    print("-" * 70)
+    for mode, row in report.items():
+        print(f"{mode:<22}{row['succeeded']:>3}/{row['playlists']:<2}{row['seconds']:>10}"
+              f"{row['playlists_per_min']:>10}{row['peak_rss_mb']:>10}{row['rss_per_in_flight_mb']:>13}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analyze many playlists in one browser process.")
+    parser.add_argument("urls", nargs="*", default=["https://open.spotify.com/playlist/37i9dQZF1DWUAOn5dYbrDa"])
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--compare", action="store_true",
+                        help="also run one-driver-per-playlist and report RSS and throughput for both")
+    parser.add_argument("--show-browser", action="store_true")
+    args = parser.parse_args()
+
+    if args.compare:
+        print_benchmark(benchmark(args.urls, args.concurrency, not args.show_browser))
+    else:
+        analyzer = MultiContextPlaylistAnalyzer(args.concurrency, headless=not args.show_browser)
+        analyses = analyzer.analyze_playlists(args.urls)
+        for analysis in analyses:
+            analyzer.parser.print_summary(analysis)
+        analyzer.save_analyses(analyses)
+        print("Process finished")
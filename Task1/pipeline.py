@@ -0,0 +1,264 @@
+import argparse
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app import SpotifyPlaylistAnalyzer
+from common.rate_control import page_load_controller
+
+# Marks the end of a stage's output on a queue
+DONE = None
+
+# Parser-only analyzer, created once per worker process by _init_parser()
+_parser = None
+
+
+def _init_parser():
+    """Process pool initializer: build an analyzer without a browser."""
+    global _parser
+    _parser = SpotifyPlaylistAnalyzer(start_browser=False)
+
+
+def parse_html_file(html_path, keep_debug_html=False):
+    """Parse a spooled page source in a worker process.
+
+    Only the file path crosses the process boundary; the HTML itself is read
+    here and the spool file is removed (or kept as debug HTML) afterwards.
+    """
+    with open(html_path, 'r', encoding='utf-8') as f:
+        html_content = f.read()
+
+    if keep_debug_html:
+        debug_file = os.path.join(_parser.results_dir, f"debug_{os.path.basename(html_path)}")
+        shutil.move(html_path, debug_file)
+    else:
+        os.remove(html_path)
+
+    return _parser.parse_playlist_html(html_content)
+
+
+def default_spool_dir():
+    """Prefer the RAM-backed /dev/shm so handing off HTML never touches disk."""
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+
+class PlaylistPipeline:
+    """Staged fetch -> parse -> write pipeline for many playlists.
+
+    Fetch threads each own one browser and only load pages and capture the raw
+    HTML, which they spool to a file and hand off over a bounded queue. A
+    process pool parses the HTML on all cores while the browsers move on to the
+    next playlist, and a single writer thread assembles and saves the results.
+    When parsing falls behind, the bounded queue blocks the fetchers instead of
+    letting spooled pages pile up.
+    """
+
+    def __init__(self, fetch_workers=2, parse_workers=None, queue_size=None,
+                 headless=True, rate_controller=None, spool_dir=None, keep_debug_html=False):
+        """Initialize the pipeline; browsers and processes start in run()."""
+        self.fetch_workers = fetch_workers
+        self.parse_workers = parse_workers or os.cpu_count() or 1
+        self.queue_size = queue_size or 2 * self.parse_workers
+        self.headless = headless
+        self.rate_controller = rate_controller or page_load_controller(fetch_workers)
+        self.spool_root = spool_dir or default_spool_dir()
+        self.spool_dir = None
+        self.keep_debug_html = keep_debug_html
+        self.writer = SpotifyPlaylistAnalyzer(start_browser=False)
+
+        self.stats = {"fetched": 0, "parsed": 0, "saved": 0, "failed": 0,
+                      "fetch_seconds": 0.0, "fetch_wait_seconds": 0.0}
+        self._stats_lock = threading.Lock()
+
+    def _add_stat(self, key, value=1):
+        with self._stats_lock:
+            self.stats[key] += value
+
+    def _spool_html(self, html_content):
+        """Write page source to the spool directory and return its path."""
+        fd, path = tempfile.mkstemp(suffix=".html", dir=self.spool_dir)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+        return path
+
+    def _put(self, html_queue, item, stop):
+        """Put onto the bounded queue, giving up once the pipeline is stopping."""
+        while not stop.is_set():
+            try:
+                html_queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fetch_worker(self, url_queue, html_queue, results_queue, stop):
+        """Fetch stage: one browser, reused for every playlist it takes."""
+        analyzer = None
+        try:
+            analyzer = SpotifyPlaylistAnalyzer(headless=self.headless, rate_controller=self.rate_controller)
+            while not stop.is_set():
+                playlist_url = url_queue.get()
+                if playlist_url is DONE:
+                    break
+
+                print(f"Fetching playlist: {playlist_url}")
+                start = time.monotonic()
+                try:
+                    html_path = self._spool_html(analyzer.fetch_playlist_html(playlist_url))
+                except Exception as e:
+                    print(f"Error fetching playlist {playlist_url}: {str(e)}")
+                    results_queue.put((playlist_url, None))
+                    continue
+                self._add_stat("fetch_seconds", time.monotonic() - start)
+                self._add_stat("fetched")
+
+                # Blocks while the parsers are behind
+                start = time.monotonic()
+                if not self._put(html_queue, (playlist_url, html_path), stop):
+                    break
+                self._add_stat("fetch_wait_seconds", time.monotonic() - start)
+        except Exception as e:
+            print(f"Fetch worker failed: {str(e)}")
+        finally:
+            if analyzer:
+                analyzer.close()
+            self._put(html_queue, DONE, stop)
+
+    def _fail_unprocessed(self, url_queue, html_queue, results_queue):
+        """Report playlists still queued after the fetchers stopped as failed.
+
+        This covers URLs no fetcher got to (e.g. no browser could start) and
+        pages that were fetched but never handed to the parse pool.
+        """
+        leftovers = []
+        for pending in (url_queue, html_queue):
+            while True:
+                try:
+                    item = pending.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not DONE:
+                    leftovers.append(item if pending is url_queue else item[0])
+
+        for playlist_url in leftovers:
+            print(f"Playlist not processed: {playlist_url}")
+            results_queue.put((playlist_url, None))
+
+    def _writer(self, results_queue, saved):
+        """Write stage: assemble each analysis and serialize it to JSON."""
+        while True:
+            item = results_queue.get()
+            if item is DONE:
+                break
+
+            playlist_url, playlist_data = item
+            if not playlist_data:
+                self._add_stat("failed")
+                continue
+
+            try:
+                analysis = self.writer.build_analysis(playlist_url, playlist_data)
+                saved.append(self.writer.save_analysis(analysis))
+                self._add_stat("saved")
+            except Exception as e:
+                print(f"Error saving analysis for {playlist_url}: {str(e)}")
+                self._add_stat("failed")
+
+    def run(self, playlist_urls):
+        """Run all playlists through the pipeline and return the saved file paths."""
+        url_queue = queue.Queue()
+        html_queue = queue.Queue(maxsize=self.queue_size)
+        results_queue = queue.Queue()
+        stop = threading.Event()
+        saved = []
+        # A fresh spool directory per run; it is removed when the run ends
+        self.spool_dir = tempfile.mkdtemp(prefix="playlist_html_", dir=self.spool_root)
+
+        for playlist_url in playlist_urls:
+            url_queue.put(playlist_url)
+        fetchers = min(self.fetch_workers, len(playlist_urls)) or 1
+        for _ in range(fetchers):
+            url_queue.put(DONE)
+
+        writer = threading.Thread(target=self._writer, args=(results_queue, saved))
+        writer.start()
+        fetch_threads = [
+            threading.Thread(target=self._fetch_worker, args=(url_queue, html_queue, results_queue, stop))
+            for _ in range(fetchers)
+        ]
+        for thread in fetch_threads:
+            thread.start()
+
+        # Cap outstanding parse jobs so the pool cannot drain the bounded queue
+        in_flight = threading.BoundedSemaphore(self.parse_workers * 2)
+
+        def on_parsed(playlist_url, future):
+            try:
+                playlist_data = future.result()
+                self._add_stat("parsed")
+            except Exception as e:
+                print(f"Error parsing playlist {playlist_url}: {str(e)}")
+                playlist_data = None
+            results_queue.put((playlist_url, playlist_data))
+            in_flight.release()
+
+        start = time.monotonic()
+        try:
+            with ProcessPoolExecutor(max_workers=self.parse_workers, initializer=_init_parser) as pool:
+                finished_fetchers = 0
+                while finished_fetchers < fetchers:
+                    item = html_queue.get()
+                    if item is DONE:
+                        finished_fetchers += 1
+                        continue
+
+                    playlist_url, html_path = item
+                    in_flight.acquire()
+                    future = pool.submit(parse_html_file, html_path, self.keep_debug_html)
+                    future.add_done_callback(lambda f, url=playlist_url: on_parsed(url, f))
+        finally:
+            # If the loop above failed (broken pool, Ctrl-C) nothing reads the
+            # bounded queue any more; the stop event unblocks waiting fetchers
+            stop.set()
+            for thread in fetch_threads:
+                thread.join()
+            self._fail_unprocessed(url_queue, html_queue, results_queue)
+            results_queue.put(DONE)
+            writer.join()
+            shutil.rmtree(self.spool_dir, ignore_errors=True)
+
+        self.stats["elapsed_seconds"] = round(time.monotonic() - start, 1)
+        return saved
+
+    def print_stats(self):
+        """Print stage counters and how long fetchers were blocked on parsers."""
+        stats = self.stats
+        print("\n" + "="*70)
+        print("PIPELINE SUMMARY")
+        print("="*70)
+        print(f"Fetch workers: {self.fetch_workers}  Parse workers: {self.parse_workers}  Queue size: {self.queue_size}")
+        print(f"Fetched: {stats['fetched']}  Parsed: {stats['parsed']}  Saved: {stats['saved']}  Failed: {stats['failed']}")
+        print(f"Elapsed: {stats.get('elapsed_seconds', 0)}s")
+        print(f"Time in browsers: {stats['fetch_seconds']:.1f}s  Blocked on parsers: {stats['fetch_wait_seconds']:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape playlists with a fetch/parse/write pipeline.")
+    parser.add_argument("urls", nargs="*", default=["https://open.spotify.com/playlist/37i9dQZF1DWUAOn5dYbrDa"])
+    parser.add_argument("--fetch-workers", type=int, default=2)
+    parser.add_argument("--parse-workers", type=int, default=None)
+    parser.add_argument("--queue-size", type=int, default=None)
+    parser.add_argument("--keep-debug-html", action="store_true")
+    args = parser.parse_args()
+
+    pipeline = PlaylistPipeline(fetch_workers=args.fetch_workers, parse_workers=args.parse_workers,
+                                queue_size=args.queue_size, keep_debug_html=args.keep_debug_html)
+    pipeline.run(args.urls)
+    pipeline.print_stats()
+    print("Process finished")
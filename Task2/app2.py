@@ -1,15 +1,26 @@
-import spotipy
-from spotipy.oauth2 import SpotifyClientCredentials
 import pandas as pd
 import os
+import sys
 
-CLIENT_ID = "b466dac2e7ea450e8505d0caef51e38f"
-CLIENT_SECRET = "7bb56e9bedb7411d8da87ae8a1c26d46"
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.rate_control import AdaptiveRateController
+from common.crawl_frontier import CrawlFrontier
+from common.token_cache import SharedTokenCache
+from common.spotify_api import create_client, classify_spotify_error
+
+# Credentials come from SPOTIPY_CLIENT_ID/SPOTIPY_CLIENT_SECRET or spotify.ini;
+# the token is shared with every other process on this machine
+auth_manager = SharedTokenCache.from_config()
+
+# Retries are handled by the rate controller so it can see every 429/5xx
+sp = create_client(auth_manager)
+
+controller = AdaptiveRateController(initial_limit=2, max_limit=8, latency_target=5.0, name="spotify_api")
+
+
+def search(q, type, limit):
+    return controller.call(sp.search, q=q, type=type, limit=limit, classify=classify_spotify_error)
 
-sp = spotipy.Spotify(auth_manager=SpotifyClientCredentials(
-    client_id=CLIENT_ID,
-    client_secret=CLIENT_SECRET
-))
 
 query = "Kabir Singh"
 folder_name = f"{query.replace(' ', '_')}_Data"
@@ -17,10 +28,10 @@ os.makedirs(folder_name, exist_ok=True)
 
 limit = 50
 
-results_tracks = sp.search(q=query, type='track', limit=limit)
-results_albums = sp.search(q=query, type='album', limit=limit)
-results_artists = sp.search(q=query, type='artist', limit=limit)
-results_playlists = sp.search(q=query, type='playlist', limit=limit)
+results_tracks = search(query, 'track', limit)
+results_albums = search(query, 'album', limit)
+results_artists = search(query, 'artist', limit)
+results_playlists = search(query, 'playlist', limit)
 
 track_data = []
 for item in results_tracks.get('tracks', {}).get('items', []):
@@ -60,6 +71,7 @@ playlist_data = []
 for item in results_playlists.get('playlists', {}).get('items', []):
     if item:
         playlist_data.append({
+            'Playlist ID': item.get('id', ''),
             'Playlist Name': item.get('name', ''),
             'Owner': item.get('owner', {}).get('display_name', ''),
             'Total Tracks': item.get('tracks', {}).get('total', 0),
@@ -68,4 +80,15 @@ for item in results_playlists.get('playlists', {}).get('items', []):
 df_playlists = pd.DataFrame(playlist_data)
 df_playlists.to_csv(os.path.join(folder_name, f"{query}_playlists.csv"), index=False)
 
+# Queue discovered playlists for Task1's analyzer; known IDs are not queued twice
+frontier = CrawlFrontier()
+new_playlists = frontier.add_many([{
+    'playlist_id': row['Playlist ID'],
+    'name': row['Playlist Name'],
+    'total_tracks': row['Total Tracks'],
+    'source_query': query
+} for row in playlist_data])
+print(f"Queued {new_playlists} new playlists for crawling ({frontier.stats()['total']} known)")
+frontier.close()
+
 print(f"All CSVs saved in folder: {folder_name}")
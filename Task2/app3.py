@@ -1,72 +1,108 @@
+import argparse
 import pandas as pd
 import os
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from streaming_analytics import compute_streaming_aggregates
+
 sns.set(style="whitegrid")
 
 query = "Kabir Singh"
 folder = f"{query.replace(' ', '_')}_Data"
 
-df_tracks = pd.read_csv(os.path.join(folder, f"{query}_tracks.csv"))
-df_albums = pd.read_csv(os.path.join(folder, f"{query}_albums.csv"))
-df_playlists = pd.read_csv(os.path.join(folder, f"{query}_playlists.csv"))
-
-#  Most frequent artist names
-all_artists = df_tracks['Artist(s)'].dropna().str.split(', ').explode()
-top_artists = all_artists.value_counts().head(5)
-
-plt.figure(figsize=(8, 5))
-sns.barplot(x=top_artists.values, y=top_artists.index, palette="viridis")
-plt.title("Top 5 Most Frequent Artists")
-plt.xlabel("Count")
-plt.ylabel("Artist")
-plt.tight_layout()
-plt.show()
-
-# Year-wise releases
-year_counts = df_tracks['Release Year'].value_counts().sort_index()
-
-plt.figure(figsize=(8, 4))
-sns.lineplot(x=year_counts.index, y=year_counts.values, marker="o", color="teal")
-plt.title("Track Count by Release Year")
-plt.xlabel("Year")
-plt.ylabel("Number of Tracks")
-plt.tight_layout()
-plt.show()
-
-# Track duration range
-bins = [0, 120, 180, 240, 300, 600]
-labels = ['<2min', '2-3min', '3-4min', '4-5min', '5min+']
-df_tracks['Duration Range'] = pd.cut(df_tracks['Duration (sec)'], bins=bins, labels=labels, right=False)
-duration_counts = df_tracks['Duration Range'].value_counts().sort_index()
-
-plt.figure(figsize=(8, 4))
-sns.barplot(x=duration_counts.index, y=duration_counts.values, palette="mako")
-plt.title("Track Duration Ranges")
-plt.xlabel("Duration Range")
-plt.ylabel("Number of Tracks")
-plt.tight_layout()
-plt.show()
-
-# Popular albums
-top_albums = df_albums[['Album Name', 'Total Tracks']].sort_values(by='Total Tracks', ascending=False).head(5)
-
-plt.figure(figsize=(8, 4))
-sns.barplot(x='Total Tracks', y='Album Name', data=top_albums, palette="flare")
-plt.title("Top 5 Albums by Total Tracks")
-plt.xlabel("Track Count")
-plt.ylabel("Album")
-plt.tight_layout()
-plt.show()
-
-#  Popular playlists
-top_playlists = df_playlists[['Playlist Name', 'Total Tracks']].sort_values(by='Total Tracks', ascending=False).head(5)
-
-plt.figure(figsize=(8, 4))
-sns.barplot(x='Total Tracks', y='Playlist Name', data=top_playlists, palette="crest")
-plt.title("Top 5 Playlists by Total Tracks")
-plt.xlabel("Track Count")
-plt.ylabel("Playlist")
-plt.tight_layout()
-plt.show()
+
+def compute_in_memory(folder, query=query):
+    """Load each CSV fully and compute the chart data with pandas."""
+    df_tracks = pd.read_csv(os.path.join(folder, f"{query}_tracks.csv"))
+    df_albums = pd.read_csv(os.path.join(folder, f"{query}_albums.csv"))
+    df_playlists = pd.read_csv(os.path.join(folder, f"{query}_playlists.csv"))
+
+    #  Most frequent artist names
+    all_artists = df_tracks['Artist(s)'].dropna().str.split(', ').explode()
+    top_artists = all_artists.value_counts().head(5)
+
+    # Year-wise releases
+    year_counts = df_tracks['Release Year'].value_counts().sort_index()
+
+    # Track duration range
+    bins = [0, 120, 180, 240, 300, 600]
+    labels = ['<2min', '2-3min', '3-4min', '4-5min', '5min+']
+    df_tracks['Duration Range'] = pd.cut(df_tracks['Duration (sec)'], bins=bins, labels=labels, right=False)
+    duration_counts = df_tracks['Duration Range'].value_counts().sort_index()
+
+    # Popular albums (stable sort: ties keep file order, as in the streaming TopK)
+    top_albums = df_albums[['Album Name', 'Total Tracks']].sort_values(by='Total Tracks', ascending=False, kind='stable').head(5)
+
+    #  Popular playlists
+    top_playlists = df_playlists[['Playlist Name', 'Total Tracks']].sort_values(by='Total Tracks', ascending=False, kind='stable').head(5)
+
+    return top_artists, year_counts, duration_counts, top_albums, top_playlists
+
+
+def compute_streaming(inputs):
+    """Compute the same chart data chunk by chunk across any number of files."""
+    aggregates = compute_streaming_aggregates(inputs)
+    return (aggregates.top_artists(), aggregates.year_series(), aggregates.duration_series(),
+            aggregates.albums_frame(), aggregates.playlists_frame())
+
+
+def plot_charts(top_artists, year_counts, duration_counts, top_albums, top_playlists):
+    #  Most frequent artist names
+    plt.figure(figsize=(8, 5))
+    sns.barplot(x=top_artists.values, y=top_artists.index, palette="viridis")
+    plt.title("Top 5 Most Frequent Artists")
+    plt.xlabel("Count")
+    plt.ylabel("Artist")
+    plt.tight_layout()
+    plt.show()
+
+    # Year-wise releases
+    plt.figure(figsize=(8, 4))
+    sns.lineplot(x=year_counts.index, y=year_counts.values, marker="o", color="teal")
+    plt.title("Track Count by Release Year")
+    plt.xlabel("Year")
+    plt.ylabel("Number of Tracks")
+    plt.tight_layout()
+    plt.show()
+
+    # Track duration range
+    plt.figure(figsize=(8, 4))
+    sns.barplot(x=duration_counts.index, y=duration_counts.values, palette="mako")
+    plt.title("Track Duration Ranges")
+    plt.xlabel("Duration Range")
+    plt.ylabel("Number of Tracks")
+    plt.tight_layout()
+    plt.show()
+
+    # Popular albums
+    plt.figure(figsize=(8, 4))
+    sns.barplot(x='Total Tracks', y='Album Name', data=top_albums, palette="flare")
+    plt.title("Top 5 Albums by Total Tracks")
+    plt.xlabel("Track Count")
+    plt.ylabel("Album")
+    plt.tight_layout()
+    plt.show()
+
+    #  Popular playlists
+    plt.figure(figsize=(8, 4))
+    sns.barplot(x='Total Tracks', y='Playlist Name', data=top_playlists, palette="crest")
+    plt.title("Top 5 Playlists by Total Tracks")
+    plt.xlabel("Track Count")
+    plt.ylabel("Playlist")
+    plt.tight_layout()
+    plt.show()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chart the Spotify search results collected by app2.py.")
+    parser.add_argument("--streaming", action="store_true",
+                        help="aggregate out of core, chunk by chunk across all inputs")
+    parser.add_argument("inputs", nargs="*", default=[folder],
+                        help="query folders, files or glob patterns (streaming mode only)")
+    args = parser.parse_args()
+
+    if args.streaming:
+        plot_charts(*compute_streaming(args.inputs))
+    else:
+        plot_charts(*compute_in_memory(folder))
@@ -0,0 +1,226 @@
+import glob
+import heapq
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+# Same bins as the in-memory duration chart in app3.py
+DURATION_BINS = [0, 120, 180, 240, 300, 600]
+DURATION_LABELS = ['<2min', '2-3min', '3-4min', '4-5min', '5min+']
+TOP_K = 5
+# Counters kept for top artists; far more than TOP_K so the top 5 are exact in practice
+ARTIST_CAPACITY = 10_000
+
+
+class TopK:
+    """Mergeable top-k by a numeric value, kept as a bounded min-heap."""
+
+    def __init__(self, k=TOP_K):
+        self.k = k
+        self.heap = []
+        self.seen = 0
+
+    def add(self, value, item):
+        """Offer one (value, item) pair."""
+        # seen breaks ties in arrival order and keeps items out of comparisons
+        entry = (value, -self.seen, item)
+        self.seen += 1
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+        elif entry > self.heap[0]:
+            heapq.heapreplace(self.heap, entry)
+
+    def merge(self, other):
+        """Fold another partial top-k into this one."""
+        for value, _, item in sorted(other.heap, reverse=True):
+            self.add(value, item)
+        return self
+
+    def items(self):
+        """Return (value, item) pairs, largest first."""
+        return [(value, item) for value, _, item in sorted(self.heap, reverse=True)]
+
+
+class HeavyHitters:
+    """Mergeable Misra-Gries summary of the most frequent items.
+
+    At most ``capacity`` counters are kept however many distinct items are
+    added. Counts are exact until that many distinct items have been seen;
+    after that each count may be up to ``error`` below the true count, and
+    every item occurring more than total/(capacity + 1) times is still kept.
+    """
+
+    def __init__(self, capacity=ARTIST_CAPACITY):
+        self.capacity = capacity
+        self.counts = Counter()
+        self.error = 0
+
+    def update(self, counts):
+        """Add a mapping of item -> count."""
+        self.counts.update(counts)
+        self._prune()
+
+    def merge(self, other):
+        """Fold another summary into this one."""
+        self.counts.update(other.counts)
+        self.error += other.error
+        self._prune()
+        return self
+
+    def _prune(self):
+        """Subtract the (capacity+1)-th largest count and drop counters that reach zero."""
+        if len(self.counts) <= self.capacity:
+            return
+        threshold = heapq.nlargest(self.capacity + 1, self.counts.values())[-1]
+        self.error += threshold
+        self.counts = Counter({item: count - threshold for item, count in self.counts.items() if count > threshold})
+
+    def most_common(self, n):
+        """Return the n largest (item, count) pairs."""
+        return self.counts.most_common(n)
+
+
+class Aggregates:
+    """Partial results for the app3 charts that can be merged across chunks and files."""
+
+    def __init__(self):
+        self.artist_counts = HeavyHitters()
+        self.year_counts = Counter()
+        self.duration_counts = Counter()
+        self.top_albums = TopK()
+        self.top_playlists = TopK()
+        self.rows = Counter()
+
+    def merge(self, other):
+        """Fold another Aggregates into this one."""
+        self.artist_counts.merge(other.artist_counts)
+        self.year_counts.update(other.year_counts)
+        self.duration_counts.update(other.duration_counts)
+        self.top_albums.merge(other.top_albums)
+        self.top_playlists.merge(other.top_playlists)
+        self.rows.update(other.rows)
+        return self
+
+    def add_tracks(self, chunk):
+        """Accumulate artist, release-year and duration-bin counts for a tracks chunk."""
+        self.rows["tracks"] += len(chunk)
+
+        artists = chunk['Artist(s)'].dropna().str.split(', ').explode()
+        self.artist_counts.update(artists.value_counts().to_dict())
+
+        self.year_counts.update(chunk['Release Year'].value_counts().to_dict())
+
+        ranges = pd.cut(chunk['Duration (sec)'], bins=DURATION_BINS, labels=DURATION_LABELS, right=False)
+        self.duration_counts.update(ranges.value_counts().to_dict())
+
+    def add_albums(self, chunk):
+        """Keep the largest albums by total tracks seen so far."""
+        self.rows["albums"] += len(chunk)
+        top = chunk[['Album Name', 'Total Tracks']].nlargest(TOP_K, 'Total Tracks')
+        for row in top.itertuples(index=False):
+            self.top_albums.add(row[1], row[0])
+
+    def add_playlists(self, chunk):
+        """Keep the largest playlists by total tracks seen so far."""
+        self.rows["playlists"] += len(chunk)
+        top = chunk[['Playlist Name', 'Total Tracks']].nlargest(TOP_K, 'Total Tracks')
+        for row in top.itertuples(index=False):
+            self.top_playlists.add(row[1], row[0])
+
+    def top_artists(self):
+        """Series of the 5 most frequent artists, as in app3."""
+        return pd.Series(dict(self.artist_counts.most_common(TOP_K)), dtype='int64')
+
+    def year_series(self):
+        """Track counts per release year, sorted by year."""
+        return pd.Series(self.year_counts, dtype='int64').sort_index()
+
+    def duration_series(self):
+        """Track counts per duration range, in bin order."""
+        return pd.Series({label: self.duration_counts.get(label, 0) for label in DURATION_LABELS}, dtype='int64')
+
+    def albums_frame(self):
+        """Top albums as a DataFrame with app3's column names."""
+        return pd.DataFrame([(name, total) for total, name in self.top_albums.items()],
+                            columns=['Album Name', 'Total Tracks'])
+
+    def playlists_frame(self):
+        """Top playlists as a DataFrame with app3's column names."""
+        return pd.DataFrame([(name, total) for total, name in self.top_playlists.items()],
+                            columns=['Playlist Name', 'Total Tracks'])
+
+
+# Columns each kind of file needs; only these are read
+KIND_COLUMNS = {
+    'tracks': ['Artist(s)', 'Release Year', 'Duration (sec)'],
+    'albums': ['Album Name', 'Total Tracks'],
+    'playlists': ['Playlist Name', 'Total Tracks'],
+}
+
+
+def iter_chunks(path, columns, chunksize):
+    """Yield DataFrame chunks of a CSV or Parquet file without loading it whole."""
+    if path.endswith('.parquet'):
+        if pq is None:
+            raise ImportError("pyarrow is required to read Parquet files: pip install pyarrow")
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunksize)
+
+
+def file_kind(path):
+    """Return 'tracks', 'albums' or 'playlists' from a `{query}_{kind}.csv` name."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    kind = stem.rsplit('_', 1)[-1]
+    return kind if kind in KIND_COLUMNS else None
+
+
+def aggregate_file(path, chunksize=100_000):
+    """Compute partial aggregates for one file, one chunk at a time."""
+    kind = file_kind(path)
+    partial = Aggregates()
+    add_chunk = getattr(partial, f"add_{kind}")
+    for chunk in iter_chunks(path, KIND_COLUMNS[kind], chunksize):
+        add_chunk(chunk)
+    return partial
+
+
+def find_input_files(inputs):
+    """Expand folders and glob patterns into tracks/albums/playlists files."""
+    paths = []
+    for item in inputs:
+        # A pattern like "archive/*_Data" can match folders as well as files
+        for match in glob.glob(item):
+            if os.path.isdir(match):
+                for ext in ('csv', 'parquet'):
+                    paths.extend(glob.glob(os.path.join(match, f"*.{ext}")))
+            else:
+                paths.append(match)
+    return sorted(p for p in set(paths) if file_kind(p))
+
+
+def compute_streaming_aggregates(inputs, chunksize=100_000, workers=None):
+    """Aggregate every input file in parallel and merge the partial results.
+
+    Memory per worker is bounded by the chunk size plus the partial results:
+    at most ARTIST_CAPACITY artist counters, one counter per release year and
+    fixed-size duration bins and top-k heaps.
+    """
+    paths = find_input_files(inputs)
+    if not paths:
+        raise FileNotFoundError(f"No *_tracks/_albums/_playlists CSV or Parquet files found in {inputs}")
+
+    total = Aggregates()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for partial in pool.map(aggregate_file, paths, [chunksize] * len(paths)):
+            total.merge(partial)
+    return total
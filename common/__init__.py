@@ -0,0 +1 @@
+"""Helpers shared by the Task1 scraper and the Task2 API scripts."""
@@ -0,0 +1,239 @@
+import argparse
+import csv
+import glob
+import math
+import os
+import sqlite3
+import time
+
+DEFAULT_DB_PATH = os.environ.get(
+    "CRAWL_FRONTIER_DB",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "crawl_frontier.db")
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS playlists (
+    playlist_id     TEXT PRIMARY KEY,
+    name            TEXT,
+    total_tracks    INTEGER,
+    scraped_tracks  INTEGER,
+    source_query    TEXT,
+    priority        REAL NOT NULL,
+    status          TEXT NOT NULL DEFAULT 'queued',
+    discovered_at   REAL NOT NULL,
+    last_crawled_at REAL,
+    next_due_at     REAL NOT NULL,
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    last_error      TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_playlists_due ON playlists (next_due_at, priority);
+"""
+
+
+def parse_track_count(value):
+    """Return a track count as int, accepting "50.0" as pandas writes it; None if missing.
+
+    Raises ValueError for values that are not a number.
+    """
+    if value is None or value == "":
+        return None
+    return int(float(value))
+
+
+def playlist_url(playlist_id):
+    """Build the public web URL analyze_playlist() expects."""
+    return f"https://open.spotify.com/playlist/{playlist_id}"
+
+
+class CrawlFrontier:
+    """Persistent, deduplicated priority queue of playlists to analyze.
+
+    Backed by SQLite so it survives restarts and can be shared by several
+    processes. The primary key doubles as the persistent "seen" set: adding a
+    known playlist never queues it twice, it only refreshes its metadata and
+    pulls it forward if its track count changed. Due playlists are handed out
+    biggest first, and a claimed playlist is leased rather than removed, so
+    work from a crashed worker becomes due again once the lease expires.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, refresh_interval=7 * 24 * 3600,
+                 lease_seconds=15 * 60, max_backoff=24 * 3600):
+        """Open (or create) the frontier database."""
+        self.db_path = db_path
+        self.refresh_interval = refresh_interval
+        self.lease_seconds = lease_seconds
+        self.max_backoff = max_backoff
+
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+        # Databases created before scraped_tracks existed
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(playlists)")}
+        if "scraped_tracks" not in columns:
+            self.conn.execute("ALTER TABLE playlists ADD COLUMN scraped_tracks INTEGER")
+
+    def compute_priority(self, total_tracks):
+        """Bigger playlists first; log scale so one huge list does not dominate."""
+        return math.log1p(max(int(total_tracks or 0), 0))
+
+    def add(self, playlist_id, name=None, total_tracks=None, source_query=None):
+        """Queue a playlist unless it is already known; return True if it was new."""
+        return self.add_many([{
+            "playlist_id": playlist_id, "name": name,
+            "total_tracks": total_tracks, "source_query": source_query,
+        }]) == 1
+
+    def add_many(self, playlists):
+        """Queue a batch of playlist dicts in one transaction; return how many were new."""
+        now = time.time()
+        added = 0
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            for item in playlists:
+                playlist_id = item.get("playlist_id")
+                if not playlist_id:
+                    continue
+                try:
+                    total_tracks = parse_track_count(item.get("total_tracks"))
+                except (TypeError, ValueError, OverflowError):
+                    print(f"Skipping playlist {playlist_id}: bad track count {item.get('total_tracks')!r}")
+                    continue
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO playlists (playlist_id, name, total_tracks, source_query, "
+                    "priority, discovered_at, next_due_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (playlist_id, item.get("name"), total_tracks, item.get("source_query"),
+                     self.compute_priority(total_tracks), now, now)
+                )
+                if cursor.rowcount:
+                    added += 1
+                    continue
+
+                # Known playlist: refresh metadata, and make it due now if the API
+                # reports a different size. Failed rows keep their backoff.
+                self.conn.execute(
+                    "UPDATE playlists SET name = COALESCE(?, name), "
+                    "next_due_at = CASE WHEN ? IS NOT NULL AND total_tracks IS NOT ? "
+                    "AND status NOT IN ('in_progress', 'failed') "
+                    "THEN MIN(next_due_at, ?) ELSE next_due_at END, "
+                    "total_tracks = COALESCE(?, total_tracks), priority = COALESCE(?, priority) "
+                    "WHERE playlist_id = ?",
+                    (item.get("name"), total_tracks, total_tracks, now, total_tracks,
+                     None if total_tracks is None else self.compute_priority(total_tracks), playlist_id)
+                )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        return added
+
+    def claim(self, limit=1):
+        """Lease up to `limit` due playlists, highest priority first."""
+        now = time.time()
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = self.conn.execute(
+                "SELECT playlist_id, name, total_tracks FROM playlists WHERE next_due_at <= ? "
+                "ORDER BY last_crawled_at IS NOT NULL, priority DESC, next_due_at LIMIT ?",
+                (now, limit)
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE playlists SET status = 'in_progress', next_due_at = ? WHERE playlist_id = ?",
+                [(now + self.lease_seconds, row[0]) for row in rows]
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        return [{"playlist_id": r[0], "name": r[1], "total_tracks": r[2], "url": playlist_url(r[0])}
+                for r in rows]
+
+    def complete(self, playlist_id, scraped_tracks=None):
+        """Mark a playlist crawled and schedule its next refresh.
+
+        The scraped song count is kept apart from the API's total_tracks so
+        that add_many() only ever compares API counts with API counts.
+        """
+        now = time.time()
+        self.conn.execute(
+            "UPDATE playlists SET status = 'done', last_crawled_at = ?, next_due_at = ?, attempts = 0, "
+            "last_error = NULL, scraped_tracks = COALESCE(?, scraped_tracks) WHERE playlist_id = ?",
+            (now, now + self.refresh_interval, scraped_tracks, playlist_id)
+        )
+
+    def fail(self, playlist_id, error=""):
+        """Record a failed crawl and retry later with exponential backoff."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Increment in SQL so concurrent failures from other processes are not lost
+            self.conn.execute(
+                "UPDATE playlists SET status = 'failed', attempts = attempts + 1, last_error = ? "
+                "WHERE playlist_id = ?",
+                (str(error)[:500], playlist_id)
+            )
+            row = self.conn.execute("SELECT attempts FROM playlists WHERE playlist_id = ?",
+                                    (playlist_id,)).fetchone()
+            if row:
+                backoff = min(self.max_backoff, 60 * 2 ** row[0])
+                self.conn.execute("UPDATE playlists SET next_due_at = ? WHERE playlist_id = ?",
+                                  (time.time() + backoff, playlist_id))
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def stats(self):
+        """Return playlist counts by status plus how many are due now."""
+        counts = dict(self.conn.execute("SELECT status, COUNT(*) FROM playlists GROUP BY status").fetchall())
+        counts["due"] = self.conn.execute(
+            "SELECT COUNT(*) FROM playlists WHERE next_due_at <= ?", (time.time(),)
+        ).fetchone()[0]
+        counts["total"] = self.conn.execute("SELECT COUNT(*) FROM playlists").fetchone()[0]
+        return counts
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+
+def seed_from_csvs(frontier, paths):
+    """Queue playlists from Task2 `*_playlists.csv` files that carry a Playlist ID column."""
+    added = 0
+    for path in paths:
+        query = os.path.basename(path).rsplit("_playlists", 1)[0]
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        if rows and "Playlist ID" not in rows[0]:
+            print(f"Skipping {path}: no 'Playlist ID' column (re-run app2.py to regenerate it)")
+            continue
+        added += frontier.add_many([{
+            "playlist_id": row.get("Playlist ID"),
+            "name": row.get("Playlist Name"),
+            "total_tracks": row.get("Total Tracks") or None,
+            "source_query": query,
+        } for row in rows])
+    return added
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the playlist crawl frontier.")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    seed = subparsers.add_parser("seed", help="queue playlists from *_playlists.csv files or folders")
+    seed.add_argument("inputs", nargs="+")
+    subparsers.add_parser("stats", help="show queue counts")
+    args = parser.parse_args()
+
+    frontier = CrawlFrontier(args.db)
+    if args.command == "seed":
+        paths = []
+        for item in args.inputs:
+            pattern = os.path.join(item, "*_playlists.csv") if os.path.isdir(item) else item
+            paths.extend(glob.glob(pattern))
+        print(f"Queued {seed_from_csvs(frontier, paths)} new playlists from {len(paths)} files")
+    print(f"Frontier: {frontier.stats()}")
+    frontier.close()
@@ -0,0 +1,291 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker is open and no request may be sent."""
+
+
+class ThrottledError(Exception):
+    """Raised when a request was rejected with 429/5xx and should be retried."""
+
+    def __init__(self, message, status=None, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class PageUnavailableError(Exception):
+    """Raised when a page returns a 4xx other than 429; retrying will not help."""
+
+
+def parse_retry_after(value):
+    """Parse a Retry-After header (seconds or HTTP date) into seconds."""
+    if value is None or value == "":
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(str(value))
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateController:
+    """AIMD concurrency limiter with Retry-After handling and a circuit breaker.
+
+    One instance is meant to be shared by every worker that talks to the same
+    backend (browser page loads or API calls). Workers take a slot with
+    ``slot()`` and report the outcome with ``record()``; the controller grows
+    the in-flight limit by roughly one per round trip while responses are
+    healthy and halves it on 429/5xx, timeouts or slow responses. After a
+    failure without a Retry-After header every worker waits out a jittered
+    exponential backoff before the next request starts.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, initial_limit=2, min_limit=1, max_limit=16,
+                 increase_step=1.0, decrease_factor=0.5, latency_target=10.0,
+                 failure_threshold=5, recovery_timeout=30.0, base_backoff=0.5,
+                 max_backoff=30.0, name="controller"):
+        """Initialize the controller with its AIMD and breaker settings."""
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.latency_target = latency_target
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self.limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.last_decrease = 0.0
+        # Smoothed latency of answered requests, as in TCP's SRTT
+        self.srtt = None
+
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+
+        self.stats = {"success": 0, "throttled": 0, "server_error": 0,
+                      "timeout": 0, "slow": 0, "circuit_opened": 0}
+
+        self._cond = threading.Condition()
+
+    def current_limit(self):
+        """Return the whole number of requests currently allowed in flight."""
+        return max(self.min_limit, int(self.limit))
+
+    def _can_start(self, now):
+        """Check whether a new request may start right now (lock held)."""
+        if now < self.blocked_until:
+            return False, self.blocked_until - now
+
+        if self.state == self.OPEN:
+            reopen_at = self.opened_at + self.recovery_timeout
+            if now < reopen_at:
+                return False, reopen_at - now
+            self.state = self.HALF_OPEN
+
+        if self.state == self.HALF_OPEN:
+            # Only a single probe request is allowed through. The probe is
+            # whatever holds the only slot, so releasing it (even without a
+            # recorded outcome) lets the next request probe instead.
+            return self.in_flight == 0, None
+
+        return self.in_flight < self.current_limit(), None
+
+    def acquire(self, timeout=None):
+        """Block until a request slot is free; return False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                allowed, wait_for = self._can_start(now)
+                if allowed:
+                    self.in_flight += 1
+                    return True
+
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        return False
+                    wait_for = remaining if wait_for is None else min(wait_for, remaining)
+                self._cond.wait(wait_for)
+
+    def release(self):
+        """Give back a slot taken with acquire()."""
+        with self._cond:
+            self.in_flight = max(0, self.in_flight - 1)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, timeout=None):
+        """Context manager wrapping acquire()/release()."""
+        if not self.acquire(timeout):
+            raise CircuitOpenError(f"{self.name}: no slot available within {timeout}s")
+        try:
+            yield
+        finally:
+            self.release()
+
+    def record(self, latency=None, status=None, timed_out=False, retry_after=None):
+        """Feed one observed outcome back into the controller."""
+        now = time.monotonic()
+
+        with self._cond:
+            if timed_out:
+                kind = "timeout"
+            elif status == 429:
+                kind = "throttled"
+            elif status is not None and status >= 500:
+                kind = "server_error"
+            elif latency is not None and latency > self.latency_target:
+                kind = "slow"
+            else:
+                kind = "success"
+            self.stats[kind] += 1
+
+            if latency is not None and not timed_out:
+                self.srtt = latency if self.srtt is None else 0.875 * self.srtt + 0.125 * latency
+
+            if kind == "success":
+                self._on_success()
+            elif kind == "slow":
+                # Slow but answered: back off without counting towards the breaker,
+                # and a slow probe still shows the backend is reachable again
+                if self.state == self.HALF_OPEN:
+                    self.state = self.CLOSED
+                    self.consecutive_failures = 0
+                self._decrease(now)
+            else:
+                self._on_failure(now)
+
+            delay = parse_retry_after(retry_after)
+            if delay is None and kind in ("throttled", "server_error", "timeout"):
+                delay = self.backoff_delay()
+            if delay is not None:
+                self.blocked_until = max(self.blocked_until, now + delay)
+
+            self._cond.notify_all()
+
+        return kind
+
+    def backoff_delay(self):
+        """Exponential backoff for the current failure streak, with equal jitter."""
+        exponent = max(0, self.consecutive_failures - 1)
+        delay = min(self.max_backoff, self.base_backoff * 2 ** exponent)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _on_success(self):
+        """Additive increase: about +increase_step per full window of successes."""
+        self.consecutive_failures = 0
+        if self.state == self.HALF_OPEN:
+            self.state = self.CLOSED
+        self.limit = min(self.max_limit, self.limit + self.increase_step / max(self.limit, 1.0))
+
+    def _decrease(self, now):
+        """Multiplicative decrease, at most once per smoothed round trip.
+
+        Requests that were already in flight when the backend got overloaded
+        report that same overload; only the first of them shrinks the limit.
+        Until a latency has been observed the window is latency_target.
+        """
+        window = self.srtt if self.srtt is not None else self.latency_target
+        if now - self.last_decrease < window:
+            return
+        self.last_decrease = now
+        self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+
+    def _on_failure(self, now):
+        """Back off and trip the breaker after too many consecutive failures."""
+        self._decrease(now)
+        self.consecutive_failures += 1
+
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.stats["circuit_opened"] += 1
+            self.state = self.OPEN
+            self.opened_at = now
+
+    def call(self, func, *args, max_attempts=5, classify=None, **kwargs):
+        """Run func under the controller, retrying throttled attempts.
+
+        ``classify(exc)`` maps an exception to a ``(status, retry_after,
+        timed_out)`` tuple, or returns None if the exception is not a
+        backend/throttling error and should propagate unchanged.
+        """
+        last_error = None
+
+        for attempt in range(1, max_attempts + 1):
+            with self.slot():
+                start = time.monotonic()
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as e:
+                    latency = time.monotonic() - start
+                    outcome = classify(e) if classify else None
+                    if outcome is None and isinstance(e, ThrottledError):
+                        outcome = (e.status, e.retry_after, False)
+                    if outcome is None:
+                        raise
+                    status, retry_after, timed_out = outcome
+                    self.record(latency, status=status, timed_out=timed_out, retry_after=retry_after)
+                    last_error = e
+                    continue
+
+                self.record(time.monotonic() - start)
+                return result
+
+        raise last_error
+
+    def summary(self):
+        """Return a snapshot of the controller state for logging."""
+        with self._cond:
+            return {
+                "name": self.name,
+                "limit": self.current_limit(),
+                "in_flight": self.in_flight,
+                "state": self.state,
+                **self.stats,
+            }
+
+
+def page_load_controller(max_limit=8):
+    """Return a controller with the settings shared by all browser page loaders."""
+    return AdaptiveRateController(initial_limit=1, max_limit=max_limit,
+                                  latency_target=20.0, name="page_loads")
+
+
+def record_page_load(controller, url, latency, status=None, retry_after=None, timed_out=False):
+    """Record one page load attempt and return True if the page loaded.
+
+    Timeouts, 429 and 5xx are recorded and return False so the caller retries
+    once the controller's backoff has passed. Any other 4xx means a missing or
+    private page: retrying will not help and it says nothing about backend
+    health, so PageUnavailableError is raised without recording anything.
+    """
+    if status is not None and 400 <= status < 500 and status != 429:
+        raise PageUnavailableError(f"{url} returned HTTP {status}")
+
+    controller.record(latency, status=status, timed_out=timed_out, retry_after=retry_after)
+    return not timed_out and (status is None or status < 400)
@@ -0,0 +1,29 @@
+import requests
+import spotipy
+from spotipy.exceptions import SpotifyException
+from requests.exceptions import Timeout, ConnectionError
+
+
+def create_client(auth_manager, requests_timeout=10):
+    """Build a spotipy client whose errors reach the rate controller intact.
+
+    spotipy's default session mounts a urllib3 retry adapter; with retries
+    disabled it still matches 429/5xx and raises RetryError, which spotipy
+    reports as a header-less 429. A plain Session has no retry adapter, so
+    every error goes through spotipy's HTTPError branch with the real status
+    code and the Retry-After header.
+    """
+    return spotipy.Spotify(auth_manager=auth_manager, requests_session=requests.Session(),
+                           requests_timeout=requests_timeout)
+
+
+def classify_spotify_error(e):
+    """Map spotipy/requests errors to (status, retry_after, timed_out) for the controller."""
+    if isinstance(e, SpotifyException):
+        if e.http_status == 429 or (e.http_status or 0) >= 500:
+            headers = getattr(e, 'headers', None) or {}
+            return e.http_status, headers.get('Retry-After'), False
+        return None
+    if isinstance(e, (Timeout, ConnectionError)):
+        return None, None, True
+    return None
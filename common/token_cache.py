@@ -0,0 +1,213 @@
+import base64
+import configparser
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.parse
+import urllib.request
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+TOKEN_URL = "https://accounts.spotify.com/api/token"
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CONFIG_PATH = os.environ.get("SPOTIFY_CONFIG", os.path.join(REPO_ROOT, "spotify.ini"))
+# Per-user directory: a fixed name in the shared temp dir could be pre-created
+# by another user with a token of their choosing
+DEFAULT_CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "timemusic")
+DEFAULT_CACHE_PATH = os.path.join(DEFAULT_CACHE_DIR, "spotify_client_token.json")
+
+
+def load_config(config_path=DEFAULT_CONFIG_PATH):
+    """Read Spotify credentials and cache settings.
+
+    Environment variables (SPOTIPY_CLIENT_ID, SPOTIPY_CLIENT_SECRET,
+    SPOTIFY_TOKEN_CACHE, SPOTIFY_TOKEN_URL) take precedence over the
+    [spotify] section of the ini file.
+    """
+    parser = configparser.ConfigParser()
+    parser.read(config_path)
+    section = parser["spotify"] if parser.has_section("spotify") else {}
+
+    config = {
+        "client_id": os.environ.get("SPOTIPY_CLIENT_ID", section.get("client_id")),
+        "client_secret": os.environ.get("SPOTIPY_CLIENT_SECRET", section.get("client_secret")),
+        "token_cache": os.path.expanduser(os.environ.get("SPOTIFY_TOKEN_CACHE", section.get("token_cache", DEFAULT_CACHE_PATH))),
+        "token_url": os.environ.get("SPOTIFY_TOKEN_URL", section.get("token_url", TOKEN_URL)),
+    }
+    if not config["client_id"] or not config["client_secret"]:
+        raise ValueError(f"Spotify credentials missing: set SPOTIPY_CLIENT_ID/SPOTIPY_CLIENT_SECRET "
+                         f"or add a [spotify] section to {config_path}")
+    return config
+
+
+class FileLock:
+    """Exclusive advisory lock on a file, shared across processes and threads.
+
+    flock() only excludes other open file descriptions, so threads of one
+    process first serialize on a threading.Lock; whichever thread holds it
+    owns ``handle`` until release().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.handle = None
+        self._thread_lock = threading.Lock()
+
+    def acquire(self, blocking=True):
+        """Take the lock; with blocking=False return False if another process or thread holds it."""
+        if not self._thread_lock.acquire(blocking):
+            return False
+        try:
+            self.handle = open(self.path, "a+")
+        except OSError:
+            self._thread_lock.release()
+            raise
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.handle, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            else:
+                self.handle.seek(0)
+                mode = msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK
+                msvcrt.locking(self.handle.fileno(), mode, 1)
+        except OSError:
+            self.handle.close()
+            self.handle = None
+            self._thread_lock.release()
+            if blocking:
+                raise
+            return False
+        return True
+
+    def release(self):
+        """Drop the lock."""
+        if self.handle is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.handle, fcntl.LOCK_UN)
+            else:
+                self.handle.seek(0)
+                msvcrt.locking(self.handle.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self.handle.close()
+            self.handle = None
+            self._thread_lock.release()
+
+
+class SharedTokenCache:
+    """Client-credentials token cache shared by every worker process on a host.
+
+    The token lives in a JSON file. Readers never lock; a token is reused
+    until it is within ``refresh_margin`` seconds of expiry. At that point one
+    process takes the file lock and fetches a new token while the others keep
+    using the old one, so the auth endpoint sees one request per expiry
+    instead of one per process. Once a token has actually expired, callers
+    wait on the lock for the refresh. Can be passed to spotipy.Spotify as
+    ``auth_manager``.
+    """
+
+    def __init__(self, client_id, client_secret, cache_path=DEFAULT_CACHE_PATH,
+                 token_url=TOKEN_URL, refresh_margin=300, request_timeout=10):
+        """Initialize the cache; no request is made until a token is needed."""
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.cache_path = cache_path
+        self.token_url = token_url
+        self.refresh_margin = refresh_margin
+        self.request_timeout = request_timeout
+        os.makedirs(os.path.dirname(cache_path) or ".", mode=0o700, exist_ok=True)
+        self.lock = FileLock(cache_path + ".lock")
+        self.token_requests = 0
+
+    @classmethod
+    def from_config(cls, config_path=DEFAULT_CONFIG_PATH, **kwargs):
+        """Build a cache from load_config() settings."""
+        config = load_config(config_path)
+        return cls(config["client_id"], config["client_secret"],
+                   cache_path=config["token_cache"], token_url=config["token_url"], **kwargs)
+
+    def is_trusted(self, f):
+        """Only trust a cache file owned by us and not writable by anyone else."""
+        if not hasattr(os, "getuid"):
+            return True
+        info = os.fstat(f.fileno())
+        return info.st_uid == os.getuid() and not info.st_mode & 0o022
+
+    def read_cached_token(self):
+        """Return the cached token dict, or None if missing, untrusted or for other credentials."""
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                if not self.is_trusted(f):
+                    print(f"Ignoring token cache {self.cache_path}: owned or writable by another user")
+                    return None
+                token = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if token.get("client_id") != self.client_id:
+            return None
+        return token
+
+    def write_cached_token(self, token):
+        """Atomically replace the cache file so readers never see a partial write."""
+        directory = os.path.dirname(self.cache_path) or "."
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".token_")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(token, f)
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, self.cache_path)
+
+    def request_token(self):
+        """Fetch a new token from the token endpoint."""
+        credentials = base64.b64encode(f"{self.client_id}:{self.client_secret}".encode()).decode()
+        request = urllib.request.Request(
+            self.token_url,
+            data=urllib.parse.urlencode({"grant_type": "client_credentials"}).encode(),
+            headers={"Authorization": f"Basic {credentials}",
+                     "Content-Type": "application/x-www-form-urlencoded"},
+        )
+        with urllib.request.urlopen(request, timeout=self.request_timeout) as response:
+            payload = json.load(response)
+
+        self.token_requests += 1
+        return {
+            "client_id": self.client_id,
+            "access_token": payload["access_token"],
+            "token_type": payload.get("token_type", "Bearer"),
+            "expires_at": int(time.time()) + int(payload.get("expires_in", 3600)),
+        }
+
+    def get_token(self):
+        """Return a valid token dict, refreshing it in at most one process."""
+        now = time.time()
+        token = self.read_cached_token()
+        if token and token["expires_at"] - now > self.refresh_margin:
+            return token
+
+        still_valid = token is not None and token["expires_at"] - now > 0
+        # Someone else is already refreshing and our token still works: keep using it
+        if not self.lock.acquire(blocking=not still_valid):
+            return token
+
+        try:
+            # Re-check under the lock; another process may have just refreshed
+            token = self.read_cached_token()
+            if token and token["expires_at"] - time.time() > self.refresh_margin:
+                return token
+            token = self.request_token()
+            self.write_cached_token(token)
+            return token
+        finally:
+            self.lock.release()
+
+    def get_access_token(self, as_dict=False):
+        """spotipy auth_manager interface."""
+        token = self.get_token()
+        return token if as_dict else token["access_token"]
+
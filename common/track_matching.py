@@ -0,0 +1,273 @@
+import argparse
+import csv
+import glob
+import json
+import os
+import re
+import unicodedata
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+# Featured-artist tags: "(feat. X)", "[ft. X]", "- feat. X". A bare "ft" or
+# "feat" inside a title ("The Ft Worth Song") is left alone.
+FEAT_PATTERN = re.compile(r'[\(\[]\s*(?:feat|ft|featuring|with)\.?\s[^\)\]]*[\)\]]|\s-\s*(?:feat|ft|featuring)\.?\s.*$')
+
+# Soundtrack / version suffixes that differ between the web player and the API
+SUFFIX_PATTERNS = [
+    re.compile(r'[\(\[]\s*from\s+[^\)\]]*[\)\]]'),                       # (From "Kabir Singh")
+    re.compile(r'\s-\s*from\s+.*$'),                                     # - From "Kabir Singh"
+    re.compile(r'[\(\[][^\)\]]*(?:soundtrack|ost|motion picture)[^\)\]]*[\)\]]'),
+    re.compile(r'[\(\[][^\)\]]*(?:remaster(?:ed)?|version|edit|live|mono|stereo)[^\)\]]*[\)\]]'),
+    re.compile(r'\s-\s*(?:\d{4}\s+)?(?:remaster(?:ed)?|single version|radio edit|live)\b.*$'),
+]
+
+# "A x B" collaborations split only on a standalone x between two names, so "Malcolm X" stays whole
+ARTIST_SPLIT_PATTERN = re.compile(r'\s*(?:,|&|(?<=\S)\s+x\s+(?=\S)|\bfeat\b\.?|\bft\b\.?|\bfeaturing\b)\s*')
+
+PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+STOP_TOKENS = {"the", "a", "an", "of", "ki", "ka", "ke", "se", "hai", "ji"}
+
+
+def strip_accents(text):
+    """Fold Unicode compatibility forms and drop combining marks."""
+    if text.isascii():
+        return text
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def normalize_text(text):
+    """Lowercase, accent-fold and reduce punctuation to single spaces."""
+    if not text:
+        return ""
+    text = strip_accents(str(text)).casefold()
+    text = PUNCTUATION_PATTERN.sub(' ', text)
+    return WHITESPACE_PATTERN.sub(' ', text).strip()
+
+
+def normalize_title(title):
+    """Normalize a track or album title, dropping feat. tags and soundtrack suffixes."""
+    if not title:
+        return ""
+    title = strip_accents(str(title)).casefold()
+    title = FEAT_PATTERN.sub(' ', title)
+    for pattern in SUFFIX_PATTERNS:
+        title = pattern.sub(' ', title)
+    return normalize_text(title)
+
+
+def normalize_artists(artists):
+    """Normalize a list of artist names or a 'A, B & C' string into a set."""
+    if not artists:
+        return frozenset()
+    if not isinstance(artists, str):
+        artists = ", ".join(artists)
+    names = (normalize_text(name) for name in ARTIST_SPLIT_PATTERN.split(strip_accents(artists).casefold()))
+    return frozenset(name for name in names if name)
+
+
+def parse_duration(value):
+    """Return a duration in seconds from 'm:ss' text or a number of seconds."""
+    if value in (None, ""):
+        return None
+    text = str(value)
+    if ':' in text:
+        try:
+            minutes, seconds = text.split(':')[-2:]
+            return int(minutes) * 60 + int(seconds)
+        except ValueError:
+            return None
+    try:
+        return int(float(text))
+    except ValueError:
+        return None
+
+
+class MatchRecord:
+    """A track or album reduced to the normalized fields used for matching."""
+
+    __slots__ = ("source", "title", "tokens", "artists", "album", "duration")
+
+    def __init__(self, source, title, artists, album=None, duration=None):
+        self.source = source
+        self.title = normalize_title(title)
+        self.tokens = frozenset(self.title.split())
+        self.artists = normalize_artists(artists)
+        self.album = normalize_title(album)
+        self.duration = parse_duration(duration)
+
+    def blocking_keys(self):
+        """Cheap keys; only records that share at least one key are compared."""
+        keys = {("t", self.title)} if self.title else set()
+        content = sorted(t for t in self.tokens if t not in STOP_TOKENS and len(t) > 1)
+        for artist in self.artists:
+            for token in content[:3]:
+                keys.add(("at", artist, token))
+        # Sorted token pair catches reordered or partially decorated titles
+        if len(content) >= 2:
+            keys.add(("tt", content[0], content[1]))
+        elif content:
+            keys.add(("tt", content[0]))
+        return keys
+
+
+def similarity(left, right):
+    """Score two records between 0 and 1."""
+    if not left.title or not right.title:
+        return 0.0
+
+    title_score = SequenceMatcher(None, left.title, right.title).ratio()
+    if left.tokens and right.tokens:
+        jaccard = len(left.tokens & right.tokens) / len(left.tokens | right.tokens)
+        title_score = max(title_score, jaccard)
+
+    weights = {"title": 0.6}
+    scores = {"title": title_score}
+
+    if left.artists and right.artists:
+        weights["artists"] = 0.3
+        scores["artists"] = len(left.artists & right.artists) / min(len(left.artists), len(right.artists))
+
+    if left.album and right.album:
+        weights["album"] = 0.1
+        scores["album"] = SequenceMatcher(None, left.album, right.album).ratio()
+
+    if left.duration and right.duration:
+        weights["duration"] = 0.1
+        scores["duration"] = max(0.0, 1.0 - abs(left.duration - right.duration) / 10.0)
+
+    total = sum(weights.values())
+    return sum(scores[k] * weights[k] for k in weights) / total
+
+
+class BlockingIndex:
+    """Inverted index from blocking keys to records.
+
+    Keys shared by more than ``max_block_size`` records are treated like stop
+    words and skipped at query time, which keeps candidate sets small and the
+    overall join close to linear in the number of rows.
+    """
+
+    def __init__(self, max_block_size=200):
+        self.max_block_size = max_block_size
+        self.blocks = defaultdict(list)
+        self.records = []
+
+    def add(self, record):
+        """Index a record under all of its blocking keys."""
+        position = len(self.records)
+        self.records.append(record)
+        for key in record.blocking_keys():
+            self.blocks[key].append(position)
+
+    def candidates(self, record):
+        """Return the indexed records sharing a usable blocking key with record."""
+        positions = set()
+        for key in record.blocking_keys():
+            block = self.blocks.get(key)
+            if block and len(block) <= self.max_block_size:
+                positions.update(block)
+        return [self.records[p] for p in positions]
+
+    def best_match(self, record, threshold=0.75):
+        """Return (record, confidence) for the best candidate, or (None, best score)."""
+        best, best_score = None, 0.0
+        for candidate in self.candidates(record):
+            score = similarity(record, candidate)
+            if score > best_score:
+                best, best_score = candidate, score
+        if best_score >= threshold:
+            return best, round(best_score, 3)
+        return None, round(best_score, 3)
+
+
+def load_api_tracks(csv_paths):
+    """Build a track index from Task2 `*_tracks.csv` files."""
+    index = BlockingIndex()
+    for path in csv_paths:
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                row["source_file"] = os.path.basename(path)
+                index.add(MatchRecord(row, row.get("Track Name"), row.get("Artist(s)"),
+                                      row.get("Album"), row.get("Duration (sec)")))
+    return index
+
+
+def load_api_albums(csv_paths):
+    """Build an album index from Task2 `*_albums.csv` files."""
+    index = BlockingIndex()
+    for path in csv_paths:
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                row["source_file"] = os.path.basename(path)
+                index.add(MatchRecord(row, row.get("Album Name"), row.get("Artist(s)")))
+    return index
+
+
+def enrich_analysis(analysis, track_index, album_index=None, threshold=0.75):
+    """Fill unknown fields of Task1 tracks from matching Task2 API rows.
+
+    Tracks are matched by title/artists/album/duration; when no track matches,
+    the album is matched against album rows to recover the release year.
+    Every track gets a ``match`` entry with the confidence and source file.
+    """
+    summary = {"tracks": 0, "matched": 0, "album_matched": 0, "release_year_filled": 0}
+
+    for track in analysis.get("tracks", []):
+        summary["tracks"] += 1
+        record = MatchRecord(track, track.get("track_name"), track.get("artists"),
+                             track.get("album_name"), track.get("duration"))
+        match, confidence = track_index.best_match(record, threshold)
+        track["match"] = {"type": None, "confidence": confidence, "source_file": None}
+
+        release_year = None
+        if match:
+            summary["matched"] += 1
+            row = match.source
+            release_year = row.get("Release Year")
+            track["match"] = {"type": "track", "confidence": confidence, "source_file": row["source_file"]}
+            if track.get("album_name", "Unknown") == "Unknown" and row.get("Album"):
+                track["album_name"] = row["Album"]
+        elif album_index is not None and track.get("album_name", "Unknown") != "Unknown":
+            album_record = MatchRecord(track, track["album_name"], track.get("artists"))
+            album_match, album_confidence = album_index.best_match(album_record, threshold)
+            if album_match:
+                summary["album_matched"] += 1
+                release_year = album_match.source.get("Release Year")
+                track["match"] = {"type": "album", "confidence": album_confidence,
+                                  "source_file": album_match.source["source_file"]}
+
+        if release_year and track.get("release_year", "Unknown") == "Unknown":
+            track["release_year"] = str(release_year)
+            summary["release_year_filled"] += 1
+
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Join scraped playlist tracks with API search CSVs.")
+    parser.add_argument("analysis", help="Task1 playlist analysis JSON")
+    parser.add_argument("data_dirs", nargs="+", help="Task2 query folders containing *_tracks.csv / *_albums.csv")
+    parser.add_argument("-o", "--output", help="where to write the enriched JSON (default: alongside input)")
+    parser.add_argument("--threshold", type=float, default=0.75)
+    args = parser.parse_args()
+
+    track_files, album_files = [], []
+    for folder in args.data_dirs:
+        track_files.extend(glob.glob(os.path.join(folder, "*_tracks.csv")))
+        album_files.extend(glob.glob(os.path.join(folder, "*_albums.csv")))
+
+    with open(args.analysis, encoding='utf-8') as f:
+        analysis = json.load(f)
+
+    summary = enrich_analysis(analysis, load_api_tracks(track_files), load_api_albums(album_files), args.threshold)
+
+    output = args.output or os.path.splitext(args.analysis)[0] + "_enriched.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(analysis, f, indent=2, ensure_ascii=False)
+
+    print(f"Matched {summary['matched']}/{summary['tracks']} tracks "
+          f"({summary['album_matched']} more by album), filled {summary['release_year_filled']} release years")
+    print(f"Enriched analysis saved to: {output}")
@@ -0,0 +1,66 @@
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class MockServer:
+    """Local HTTP server that replies from a scripted list of responses.
+
+    Each queued response is ``(status, headers, body)``; once the queue is
+    empty ``default`` is used. ``hits`` counts requests of any method.
+    """
+
+    def __init__(self):
+        self.responses = []
+        self.default = (200, {}, {"ok": True})
+        self.hits = 0
+        self.lock = threading.Lock()
+
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def reply(self):
+                length = int(self.headers.get("Content-Length", 0))
+                if length:
+                    self.rfile.read(length)
+                with mock.lock:
+                    mock.hits += 1
+                    status, headers, body = mock.responses.pop(0) if mock.responses else mock.default
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = reply
+            do_POST = reply
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def queue(self, status, headers=None, body=None, times=1):
+        """Script the next `times` responses."""
+        with self.lock:
+            self.responses.extend([(status, headers or {}, body or {})] * times)
+
+
+@pytest.fixture
+def mock_server():
+    server = MockServer()
+    server.thread.start()
+    yield server
+    server.server.shutdown()
+    server.server.server_close()
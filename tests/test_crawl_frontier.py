@@ -0,0 +1,105 @@
+import time
+
+import pytest
+
+from common.crawl_frontier import CrawlFrontier, seed_from_csvs
+
+
+@pytest.fixture
+def frontier(tmp_path):
+    frontier = CrawlFrontier(str(tmp_path / "frontier.db"), lease_seconds=0.2)
+    yield frontier
+    frontier.close()
+
+
+def due_ids(frontier, limit=10):
+    return [p["playlist_id"] for p in frontier.claim(limit)]
+
+
+def next_due_at(frontier, playlist_id):
+    return frontier.conn.execute("SELECT next_due_at FROM playlists WHERE playlist_id = ?",
+                                 (playlist_id,)).fetchone()[0]
+
+
+def test_known_playlists_are_not_queued_twice(frontier):
+    assert frontier.add("a", "A", 10) is True
+    assert frontier.add("a", "A renamed", 10) is False
+    assert frontier.add_many([{"playlist_id": "a"}, {"playlist_id": "b"}, {"playlist_id": ""}]) == 1
+
+    assert frontier.stats()["total"] == 2
+    assert frontier.claim(10)[0]["name"] == "A renamed"
+
+
+def test_claims_biggest_uncrawled_playlists_first(frontier):
+    frontier.add("small", total_tracks=5)
+    frontier.add("big", total_tracks=500)
+    frontier.add("unknown")
+    frontier.add("crawled", total_tracks=1000)
+    frontier.conn.execute("UPDATE playlists SET last_crawled_at = 1, next_due_at = 0 WHERE playlist_id = 'crawled'")
+
+    assert due_ids(frontier) == ["big", "small", "unknown", "crawled"]
+
+
+def test_expired_lease_makes_playlist_due_again(frontier):
+    frontier.add("a", total_tracks=10)
+    assert due_ids(frontier) == ["a"]
+    assert due_ids(frontier) == []
+
+    time.sleep(0.25)
+    assert due_ids(frontier) == ["a"]
+
+
+def test_failures_back_off_exponentially(frontier):
+    frontier.add("a", total_tracks=10)
+    frontier.claim(1)
+
+    start = time.time()
+    frontier.fail("a", "boom")
+    assert 120 <= next_due_at(frontier, "a") - start <= 121
+    frontier.fail("a", "boom again")
+    assert 240 <= next_due_at(frontier, "a") - start <= 241
+    assert due_ids(frontier) == []
+
+    # A changed size does not pull a failed playlist forward past its backoff
+    frontier.add("a", total_tracks=11)
+    assert due_ids(frontier) == []
+
+    frontier.complete("a")
+    row = frontier.conn.execute("SELECT status, attempts, last_error FROM playlists").fetchone()
+    assert row == ("done", 0, None)
+
+
+def test_failures_from_separate_connections_all_count(frontier):
+    other = CrawlFrontier(frontier.db_path)
+    frontier.add("a")
+    frontier.fail("a")
+    other.fail("a")
+    frontier.fail("a")
+    other.close()
+
+    assert frontier.conn.execute("SELECT attempts FROM playlists").fetchone()[0] == 3
+
+
+def test_scraped_count_does_not_requeue_playlist(frontier):
+    frontier.add("a", total_tracks=100)
+    frontier.claim(1)
+    frontier.complete("a", scraped_tracks=20)
+
+    frontier.add("a", total_tracks=100)
+    assert due_ids(frontier) == []
+
+    frontier.add("a", total_tracks=120)
+    assert due_ids(frontier) == ["a"]
+
+
+def test_seed_accepts_float_counts_and_skips_bad_rows(frontier, tmp_path):
+    path = tmp_path / "Kabir Singh_playlists.csv"
+    path.write_text("Playlist Name,Playlist ID,Total Tracks\n"
+                    "Arijit Hits,p1,50.0\n"
+                    "No Count,p2,\n"
+                    "Broken,p3,lots\n", encoding="utf-8")
+
+    assert seed_from_csvs(frontier, [str(path)]) == 2
+    rows = frontier.conn.execute("SELECT playlist_id, total_tracks, source_query FROM playlists "
+                                 "ORDER BY playlist_id").fetchall()
+    assert rows == [("p1", 50, "Kabir Singh"), ("p2", None, "Kabir Singh")]
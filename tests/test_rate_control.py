@@ -0,0 +1,200 @@
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from common.rate_control import AdaptiveRateController, PageUnavailableError, page_load_controller, record_page_load
+
+
+def classify_http_error(e):
+    if isinstance(e, urllib.error.HTTPError):
+        return e.code, e.headers.get("Retry-After"), False
+    return None
+
+
+def fetch(url):
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return response.status
+
+
+def test_limit_shrinks_on_429_and_grows_back(mock_server):
+    controller = AdaptiveRateController(initial_limit=8, max_limit=8, latency_target=1.0)
+    mock_server.queue(429)
+
+    assert controller.call(fetch, mock_server.url, classify=classify_http_error) == 200
+    assert controller.stats["throttled"] == 1
+    assert controller.current_limit() == 4
+
+    for _ in range(30):
+        controller.call(fetch, mock_server.url, classify=classify_http_error)
+    assert controller.current_limit() > 4
+
+
+def test_limit_halves_once_per_round_trip():
+    controller = AdaptiveRateController(initial_limit=16, max_limit=16, latency_target=20.0)
+    with controller.slot():
+        controller.record(latency=0.3)
+
+    # One overload event seen by several in-flight requests
+    for _ in range(5):
+        controller.record(latency=0.3, status=503)
+    assert controller.current_limit() == 8
+
+    time.sleep(0.35)
+    controller.record(latency=0.3, status=503)
+    assert controller.current_limit() == 4
+
+
+def test_retry_after_blocks_new_requests(mock_server):
+    controller = AdaptiveRateController(latency_target=1.0)
+    mock_server.queue(429, {"Retry-After": "1"})
+
+    with pytest.raises(urllib.error.HTTPError):
+        controller.call(fetch, mock_server.url, max_attempts=1, classify=classify_http_error)
+
+    assert controller.acquire(timeout=0.3) is False
+    time.sleep(0.8)
+    assert controller.acquire(timeout=1) is True
+    controller.release()
+
+
+def test_retried_call_waits_for_retry_after(mock_server):
+    controller = AdaptiveRateController(latency_target=1.0)
+    mock_server.queue(429, {"Retry-After": "1"})
+
+    start = time.monotonic()
+    assert controller.call(fetch, mock_server.url, classify=classify_http_error) == 200
+    assert time.monotonic() - start >= 0.9
+    assert mock_server.hits == 2
+
+
+def test_failure_without_retry_after_backs_off_exponentially():
+    controller = AdaptiveRateController(failure_threshold=10, base_backoff=0.2, max_backoff=1.0)
+
+    for streak, delay in enumerate([0.2, 0.4, 0.8, 1.0, 1.0], start=1):
+        now = time.monotonic()
+        with controller.slot():
+            controller.record(status=503)
+        assert controller.consecutive_failures == streak
+        # Equal jitter: somewhere between half and all of the exponential delay
+        assert now + delay / 2 <= controller.blocked_until <= time.monotonic() + delay
+
+
+def test_retried_call_without_retry_after_is_spaced_out(mock_server):
+    controller = AdaptiveRateController(latency_target=1.0, base_backoff=0.2)
+    mock_server.queue(503, times=2)
+
+    start = time.monotonic()
+    assert controller.call(fetch, mock_server.url, classify=classify_http_error) == 200
+    # Backoffs of at least 0.1s and then 0.2s before the third attempt
+    assert time.monotonic() - start >= 0.3
+    assert mock_server.hits == 3
+    assert controller.state == controller.CLOSED
+
+
+def test_breaker_opens_half_opens_and_closes(mock_server):
+    controller = AdaptiveRateController(failure_threshold=2, recovery_timeout=0.3, latency_target=1.0,
+                                        base_backoff=0.1)
+    mock_server.queue(503, times=2)
+
+    with pytest.raises(urllib.error.HTTPError):
+        controller.call(fetch, mock_server.url, max_attempts=2, classify=classify_http_error)
+    assert controller.state == controller.OPEN
+    assert controller.stats["server_error"] == 2
+    assert controller.acquire(timeout=0.1) is False
+
+    time.sleep(0.3)
+    assert controller.acquire(timeout=1) is True
+    assert controller.state == controller.HALF_OPEN
+    # Only the probe may run while half-open
+    assert controller.acquire(timeout=0.1) is False
+    controller.release()
+
+    assert controller.call(fetch, mock_server.url, classify=classify_http_error) == 200
+    assert controller.state == controller.CLOSED
+
+
+def test_failed_probe_reopens_breaker(mock_server):
+    controller = AdaptiveRateController(failure_threshold=1, recovery_timeout=0.2, latency_target=1.0,
+                                        base_backoff=0.1)
+    mock_server.queue(503, times=2)
+
+    with pytest.raises(urllib.error.HTTPError):
+        controller.call(fetch, mock_server.url, max_attempts=1, classify=classify_http_error)
+    time.sleep(0.25)
+    with pytest.raises(urllib.error.HTTPError):
+        controller.call(fetch, mock_server.url, max_attempts=1, classify=classify_http_error)
+    assert controller.state == controller.OPEN
+
+
+def test_unrecorded_probe_does_not_wedge_breaker():
+    controller = AdaptiveRateController(failure_threshold=1, recovery_timeout=0.1)
+    with controller.slot():
+        controller.record(status=503)
+    time.sleep(0.15)
+
+    with pytest.raises(RuntimeError):
+        with controller.slot():
+            raise RuntimeError("probe died before recording an outcome")
+
+    assert controller.acquire(timeout=1) is True
+    controller.release()
+
+
+def test_slow_probe_closes_breaker():
+    controller = AdaptiveRateController(failure_threshold=1, recovery_timeout=0.1, latency_target=0.5)
+    with controller.slot():
+        controller.record(status=503)
+    time.sleep(0.15)
+
+    with controller.slot():
+        assert controller.record(latency=5.0) == "slow"
+    assert controller.state == controller.CLOSED
+    assert controller.acquire(timeout=1) is True
+    controller.release()
+
+
+def test_record_page_load_outcomes():
+    controller = page_load_controller(max_limit=4)
+
+    assert record_page_load(controller, "url", 2.0, status=200) is True
+    assert record_page_load(controller, "url", 60.0, timed_out=True) is False
+    assert record_page_load(controller, "url", 2.0, status=429, retry_after="0") is False
+    with pytest.raises(PageUnavailableError):
+        record_page_load(controller, "url", 2.0, status=404)
+
+    # The 404 is neither retried nor counted as a healthy or failed response
+    assert controller.stats["success"] == 1
+    assert controller.stats["timeout"] == 1
+    assert controller.stats["throttled"] == 1
+    assert controller.consecutive_failures == 2
+
+
+def test_spotify_errors_keep_status_and_retry_after(mock_server):
+    pytest.importorskip("spotipy")
+    from common.spotify_api import create_client, classify_spotify_error
+
+    class StaticAuth:
+        def get_access_token(self, as_dict=False):
+            return "test-token"
+
+    sp = create_client(StaticAuth())
+    sp.prefix = mock_server.url + "/v1/"
+    controller = AdaptiveRateController(latency_target=1.0)
+    recorded = []
+    record = controller.record
+    controller.record = lambda *args, **kwargs: recorded.append(kwargs) or record(*args, **kwargs)
+
+    mock_server.queue(503, body={"error": {"status": 503, "message": "unavailable"}})
+    mock_server.queue(429, {"Retry-After": "1"}, {"error": {"status": 429, "message": "slow down"}})
+    mock_server.default = (200, {}, {"tracks": {"items": []}})
+
+    result = controller.call(sp.search, q="x", type="track", limit=1, classify=classify_spotify_error)
+
+    assert result == {"tracks": {"items": []}}
+    assert recorded[0]["status"] == 503
+    assert recorded[1]["status"] == 429
+    assert recorded[1]["retry_after"] == "1"
+    assert controller.stats["server_error"] == 1
+    assert controller.stats["throttled"] == 1
@@ -0,0 +1,58 @@
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("pandas")
+
+TASK2_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Task2")
+sys.path.insert(0, TASK2_DIR)
+
+from streaming_analytics import HeavyHitters  # noqa: E402
+
+
+def test_heavy_hitters_exact_below_capacity():
+    summary = HeavyHitters(capacity=10)
+    summary.update({"a": 3, "b": 1})
+    summary.merge(HeavyHitters(capacity=10))
+    other = HeavyHitters(capacity=10)
+    other.update({"b": 4, "c": 2})
+    summary.merge(other)
+
+    assert summary.most_common(3) == [("b", 5), ("a", 3), ("c", 2)]
+    assert summary.error == 0
+
+
+def test_heavy_hitters_stay_bounded_and_keep_frequent_items():
+    summary = HeavyHitters(capacity=20)
+    total = 0
+    for chunk in range(50):
+        counts = {f"rare-{chunk}-{i}": 1 for i in range(30)}
+        counts["frequent"] = 10
+        summary.update(counts)
+        total += sum(counts.values())
+
+    assert len(summary.counts) <= 20
+    assert summary.most_common(1)[0][0] == "frequent"
+    # Misra-Gries: the undercount is bounded by total / (capacity + 1)
+    assert 500 - summary.counts["frequent"] <= summary.error <= total / 21
+
+
+@pytest.mark.parametrize("query", ["Kabir Singh", "Hanuman JI"])
+def test_streaming_matches_in_memory(query):
+    pytest.importorskip("matplotlib")
+    pytest.importorskip("seaborn")
+    import app3
+
+    folder = os.path.join(TASK2_DIR, f"{query.replace(' ', '_')}_Data")
+    in_memory = app3.compute_in_memory(folder, query)
+    # A tiny chunk size forces many partial results to be merged
+    aggregates = app3.compute_streaming_aggregates([folder], chunksize=7, workers=1)
+    streaming = (aggregates.top_artists(), aggregates.year_series(), aggregates.duration_series(),
+                 aggregates.albums_frame(), aggregates.playlists_frame())
+
+    for expected, actual in zip(in_memory[:3], streaming[:3]):
+        assert list(expected.index.astype(str)) == list(actual.index.astype(str))
+        assert list(expected.values) == list(actual.values)
+    for expected, actual in zip(in_memory[3:], streaming[3:]):
+        assert expected.values.tolist() == actual.values.tolist()
@@ -0,0 +1,90 @@
+import multiprocessing
+import os
+import threading
+import time
+
+import pytest
+
+from common.token_cache import SharedTokenCache
+
+TOKEN_BODY = {"access_token": "token", "token_type": "Bearer", "expires_in": 3600}
+
+
+def fetch_token(cache_path, token_url, results):
+    """One short-lived worker process with its own cache instance."""
+    cache = SharedTokenCache("test-id", "test-secret", cache_path, token_url)
+    results.put(cache.get_access_token())
+
+
+def run_processes(cache_path, token_url, count=8):
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=fetch_token, args=(cache_path, token_url, results))
+                 for _ in range(count)]
+    for process in processes:
+        process.start()
+    tokens = [results.get(timeout=30) for _ in processes]
+    for process in processes:
+        process.join()
+    return tokens
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "token.json")
+
+
+def test_cold_cache_then_near_expiry_refresh_across_processes(mock_server, cache_path):
+    mock_server.default = (200, {}, TOKEN_BODY)
+
+    assert run_processes(cache_path, mock_server.url) == ["token"] * 8
+    assert mock_server.hits == 1
+
+    # Age the token into the refresh margin: exactly one worker refreshes it
+    cache = SharedTokenCache("test-id", "test-secret", cache_path, mock_server.url)
+    token = cache.read_cached_token()
+    token["expires_at"] = int(time.time()) + 60
+    cache.write_cached_token(token)
+
+    assert run_processes(cache_path, mock_server.url) == ["token"] * 8
+    assert mock_server.hits == 2
+    assert cache.read_cached_token()["expires_at"] > time.time() + 3000
+
+
+def test_one_cache_shared_by_threads(mock_server, cache_path):
+    mock_server.default = (200, {}, TOKEN_BODY)
+    cache = SharedTokenCache("test-id", "test-secret", cache_path, mock_server.url)
+    tokens = []
+
+    def worker():
+        tokens.append(cache.get_access_token())
+
+    threads = [threading.Thread(target=worker) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert tokens == ["token"] * 16
+    assert mock_server.hits == 1
+    assert cache.lock.acquire(blocking=False) is True
+    cache.lock.release()
+
+
+def test_cache_for_other_credentials_is_not_used(mock_server, cache_path):
+    mock_server.default = (200, {}, TOKEN_BODY)
+    SharedTokenCache("other-id", "other-secret", cache_path, mock_server.url).get_access_token()
+
+    SharedTokenCache("test-id", "test-secret", cache_path, mock_server.url).get_access_token()
+    assert mock_server.hits == 2
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="ownership checks need POSIX permissions")
+def test_writable_by_others_cache_is_ignored(mock_server, cache_path):
+    mock_server.default = (200, {}, TOKEN_BODY)
+    cache = SharedTokenCache("test-id", "test-secret", cache_path, mock_server.url)
+    cache.write_cached_token({"client_id": "test-id", "access_token": "planted",
+                              "expires_at": int(time.time()) + 3600})
+    os.chmod(cache_path, 0o666)
+
+    assert cache.get_access_token() == "token"
+    assert mock_server.hits == 1
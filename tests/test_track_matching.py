@@ -0,0 +1,120 @@
+import csv
+
+import pytest
+
+from common.track_matching import (
+    MatchRecord, enrich_analysis, load_api_albums, load_api_tracks, normalize_artists, normalize_title,
+)
+
+TRACK_ROWS = [
+    {"Track Name": 'Bekhayali (From "Kabir Singh")', "Artist(s)": "Sachet Tandon, Sachet-Parampara",
+     "Album": 'Bekhayali (From "Kabir Singh")', "Release Year": "2019", "Duration (sec)": "372"},
+    {"Track Name": 'Raataan Lambiyan (From "Shershaah")', "Artist(s)": "Tanishk Bagchi, Jubin Nautiyal, Asees Kaur",
+     "Album": 'Raataan Lambiyan (From "Shershaah")', "Release Year": "2021", "Duration (sec)": "230"},
+    {"Track Name": "Tujhe Kitna Chahne Lage", "Artist(s)": "Arijit Singh, Mithoon",
+     "Album": "Kabir Singh", "Release Year": "2019", "Duration (sec)": "284"},
+]
+
+ALBUM_ROWS = [
+    {"Album Name": "Kabir Singh", "Artist(s)": "Sachet-Parampara, Vishal Mishra, Mithoon",
+     "Release Year": "2019", "Total Tracks": "9"},
+    {"Album Name": 'Kaise Hua (From "Kabir Singh")', "Artist(s)": "Vishal Mishra, Manoj Muntashir",
+     "Release Year": "2019", "Total Tracks": "1"},
+]
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(path)
+
+
+@pytest.fixture
+def indexes(tmp_path):
+    tracks = write_csv(tmp_path / "Kabir Singh_tracks.csv", TRACK_ROWS)
+    albums = write_csv(tmp_path / "Kabir Singh_albums.csv", ALBUM_ROWS)
+    return load_api_tracks([tracks]), load_api_albums([albums])
+
+
+@pytest.mark.parametrize("title, expected", [
+    ('Bekhayali (From "Kabir Singh")', "bekhayali"),
+    ("Tum Hi Ho (feat. Arijit Singh)", "tum hi ho"),
+    ("Kaise Hua - ft. Vishal Mishra", "kaise hua"),
+    ("Hanuman (Original Motion Picture Soundtrack)", "hanuman"),
+    ("Café Días", "cafe dias"),
+    ("The Ft Worth Song", "the ft worth song"),
+])
+def test_normalize_title(title, expected):
+    assert normalize_title(title) == expected
+
+
+@pytest.mark.parametrize("artists, expected", [
+    ("Tanishk Bagchi, Jubin Nautiyal & Asees Kaur", {"tanishk bagchi", "jubin nautiyal", "asees kaur"}),
+    (["Sachet Tandon", "Sachet-Parampara"], {"sachet tandon", "sachet parampara"}),
+    ("Diplo x Arijit Singh", {"diplo", "arijit singh"}),
+    ("Malcolm X", {"malcolm x"}),
+])
+def test_normalize_artists(artists, expected):
+    assert normalize_artists(artists) == expected
+
+
+def test_decorated_and_plain_titles_share_a_blocking_key():
+    api = MatchRecord({}, 'Bekhayali (From "Kabir Singh")', "Sachet Tandon, Sachet-Parampara")
+    scraped = MatchRecord({}, "Bekhayali", ["Sachet Tandon"])
+    assert api.blocking_keys() & scraped.blocking_keys()
+
+    unrelated = MatchRecord({}, "Raataan Lambiyan", ["Jubin Nautiyal"])
+    assert not api.blocking_keys() & unrelated.blocking_keys()
+
+
+def test_best_match_confidence(indexes):
+    track_index, _ = indexes
+
+    match, confidence = track_index.best_match(MatchRecord({}, "Bekhayali", ["Sachet Tandon"], duration="6:12"))
+    assert match.source["Track Name"] == 'Bekhayali (From "Kabir Singh")'
+    assert confidence == 1.0
+
+    # Same title and artist but 16s off in duration: the duration score drops to zero
+    match, confidence = track_index.best_match(MatchRecord({}, "Tujhe Kitna Chahne Lage", ["Arijit Singh"],
+                                                           duration="5:00"))
+    assert match.source["Track Name"] == "Tujhe Kitna Chahne Lage"
+    assert confidence == 0.9
+
+    # Title alone is not enough to pass the default threshold
+    match, confidence = track_index.best_match(MatchRecord({}, "Tujhe Kitna Chahne Lage", ["Someone Else"]))
+    assert match is None
+    assert confidence == pytest.approx(0.667)
+
+    match, confidence = track_index.best_match(MatchRecord({}, "Kesariya", ["Arijit Singh"]))
+    assert match is None
+    assert confidence < 0.75
+
+
+def test_enrich_analysis_fills_release_year_from_track_or_album(indexes):
+    track_index, album_index = indexes
+    analysis = {"tracks": [
+        {"track_name": "Raataan Lambiyan", "artists": ["Jubin Nautiyal", "Asees Kaur"],
+         "album_name": "Unknown", "duration": "3:50", "release_year": "Unknown"},
+        {"track_name": "Kaise Hua", "artists": ["Vishal Mishra"],
+         "album_name": "Kabir Singh", "duration": "3:55", "release_year": "Unknown"},
+        {"track_name": "Kesariya", "artists": ["Arijit Singh"],
+         "album_name": "Unknown", "duration": "4:28", "release_year": "Unknown"},
+    ]}
+
+    summary = enrich_analysis(analysis, track_index, album_index)
+    matched, by_album, unmatched = analysis["tracks"]
+
+    assert summary == {"tracks": 3, "matched": 1, "album_matched": 1, "release_year_filled": 2}
+    assert matched["match"]["type"] == "track"
+    assert matched["match"]["source_file"] == "Kabir Singh_tracks.csv"
+    assert matched["release_year"] == "2021"
+    assert matched["album_name"] == 'Raataan Lambiyan (From "Shershaah")'
+
+    assert by_album["match"]["type"] == "album"
+    assert by_album["match"]["source_file"] == "Kabir Singh_albums.csv"
+    assert by_album["release_year"] == "2019"
+
+    assert unmatched["match"]["type"] is None
+    assert unmatched["release_year"] == "Unknown"